@@ -1,21 +1,133 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic_core import to_json, to_jsonable_python
 from app.api.v1 import schemas
 from app.core.security import get_current_user, get_current_user_with_token
+from app.core.responses import ORJSONResponse
+from app.core.routing import ORJSONRoute
 from app.services.openai_service import openai_service
 from app.services.database_service import database_service
 from app.services.content_extraction_service import content_extraction_service
+from app.services.analysis_cache_service import analysis_cache_service
+from app.services.background_service import background_service
+from app.services.rss_collection_service import rss_collection_service
+from app.services.scheduler_service import scheduler_service
 from app.core.config import settings
+from app.utils.clock import iso_now
+from app.utils.text import count_words
 import datetime
 import asyncio
 import logging
 import time
 import uuid
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
+
+# AnalysisOptions flag -> analysis type name stored in the analysis metadata
+_ANALYSIS_TYPE_MAP = (
+    ("includeBiasAnalysis", "bias"),
+    ("includeSentimentAnalysis", "sentiment"),
+    ("includeFactCheck", "factCheck"),
+    ("includeClaimExtraction", "claimExtraction"),
+    ("includeExecutiveSummary", "executiveSummary"),
+)
+
+# Sections of ComprehensiveAnalysisResults emitted when the analysis was not requested
+_COMPREHENSIVE_RESULT_DEFAULTS = {
+    "executiveSummary": None,
+    "biasAnalysis": None,
+    "sentimentAnalysis": None,
+    "claimsExtracted": [],
+    "sourceCredibility": None,
+}
+
+async def _run_all(coros) -> list:
+    """Run coroutines concurrently in a TaskGroup, cancelling the others on the first exception."""
+    async with asyncio.TaskGroup() as tg:
+        handles = [tg.create_task(coro) for coro in coros]
+    return [handle.result() for handle in handles]
+
+async def _keyed(key: str, coro):
+    """Await a coroutine and tag its result with a key, for use with asyncio.as_completed."""
+    return key, await coro
+
+def _json_member(key: str, value) -> bytes:
+    """Encode a single `"key":value` JSON object member (Pydantic models included)."""
+    return to_json(key) + b":" + to_json(value)
+
+def _pending_analysis_response(
+    analysis_id: str,
+    article_id: Optional[str],
+    analysis_type: str,
+    preset: str,
+    content: str
+) -> Response:
+    """Serialize the AnalysisResultsResponse returned when an analysis is queued for background processing."""
+    envelope = schemas.AnalysisResultsResponse.model_construct(
+        status="success",
+        data=schemas.AnalysisResultsData.model_construct(
+            analysisId=analysis_id,
+            articleId=article_id,
+            analysisType=analysis_type,
+            status="pending",
+            results=None,
+            metadata=schemas.AnalysisMetadata.model_construct(
+                processingTime=0.0,
+                preset=preset,
+                wordsAnalyzed=count_words(content),
+                createdAt=datetime.datetime.utcnow()
+            )
+        ),
+        timestamp=iso_now()
+    )
+    return Response(content=schemas.ANALYSIS_RESULTS_RESPONSE_ADAPTER.dump_json(envelope), media_type="application/json")
+
+def _completed_analysis_prefix(analysis_id: str, article_id: Optional[str], analysis_type: str, stale: bool = False) -> bytes:
+    """Encode the start of a completed AnalysisResultsResponse, up to the `"results":` key."""
+    return (
+        b'{"status":"success","data":{'
+        + _json_member("analysisId", analysis_id) + b","
+        + _json_member("articleId", article_id) + b","
+        + _json_member("analysisType", analysis_type) + b","
+        + _json_member("status", "completed") + b","
+        + (b'"stale":true,' if stale else b"")
+        + b'"results":'
+    )
+
+def _completed_analysis_suffix(preset: str, content: str, start_time: float) -> bytes:
+    """Encode the metadata and timestamp that close a completed AnalysisResultsResponse."""
+    metadata = {
+        "processingTime": round(time.time() - start_time, 2),
+        "preset": preset,
+        "wordsAnalyzed": count_words(content),
+        "createdAt": datetime.datetime.utcnow()
+    }
+    return (
+        b"," + _json_member("metadata", metadata) + b"},"
+        + _json_member("timestamp", iso_now()) + b"}"
+    )
+
+def _cached_analysis_response(
+    analysis_id: str,
+    article_id: Optional[str],
+    analysis_type: str,
+    cached_results: bytes,
+    preset: str,
+    content: str,
+    start_time: float,
+    stale: bool = False
+) -> Response:
+    """Build a completed analysis response around previously cached, JSON-encoded results."""
+    body = (
+        _completed_analysis_prefix(analysis_id, article_id, analysis_type, stale)
+        + cached_results
+        + _completed_analysis_suffix(preset, content, start_time)
+    )
+    return Response(content=body, media_type="application/json")
 
 # Background processing function for async analyses
 async def process_analysis_background(
@@ -28,7 +140,34 @@ async def process_analysis_background(
     url: Optional[str] = None,
     jwt_token: Optional[str] = None
 ):
-    """Process analysis in the background and update the database with results."""
+    """Process analysis in the background, at most ANALYSIS_CONCURRENCY analyses at a time."""
+    try:
+        async with background_service.analysis_semaphore:
+            await _process_analysis(
+                analysis_id=analysis_id,
+                user_id=user_id,
+                content=content,
+                analysis_types=analysis_types,
+                preset=preset,
+                options=options,
+                url=url,
+                jwt_token=jwt_token
+            )
+    finally:
+        # Wake clients streaming this analysis so they read the final status once
+        background_service.notify(analysis_id)
+
+async def _process_analysis(
+    analysis_id: str,
+    user_id: str,
+    content: str,
+    analysis_types: List[str],
+    preset: str,
+    options: schemas.AnalysisOptions,
+    url: Optional[str] = None,
+    jwt_token: Optional[str] = None
+):
+    """Process analysis and update the database with results."""
     try:
         print(f"[DEBUG] Starting background processing for analysis {analysis_id}")
         start_time = time.time()
@@ -63,12 +202,15 @@ async def process_analysis_background(
         if options.includeExecutiveSummary:
             tasks["executiveSummary"] = openai_service.get_executive_summary(content, preset)
         
-        # Execute tasks concurrently
-        if tasks:
-            results_values = await asyncio.gather(*tasks.values())
-            results_dict = dict(zip(tasks.keys(), results_values))
-        else:
-            results_dict = {}
+        # Execute tasks concurrently; a section that raises is left out instead of
+        # discarding the sections that succeeded
+        results_values = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        results_dict = {}
+        for key, value in zip(tasks.keys(), results_values):
+            if isinstance(value, BaseException):
+                logger.warning("%s failed for analysis %s", key, analysis_id, exc_info=value)
+            else:
+                results_dict[key] = value
         
         # Check if we got any valid results from OpenAI
         valid_results = [v for v in results_dict.values() if v is not None]
@@ -86,39 +228,30 @@ async def process_analysis_background(
                     openai_service.fact_check_claim(claim.statement, claim.id) 
                     for claim in claims[:5]  # Limit to first 5 claims for performance
                 ]
-                fact_check_results = await asyncio.gather(*fact_check_tasks)
+                fact_check_results = await asyncio.gather(*fact_check_tasks, return_exceptions=True)
                 # Filter out failed fact-check results
-                fact_check_results = [result for result in fact_check_results if result is not None]
+                fact_check_results = [
+                    result for result in fact_check_results
+                    if result is not None and not isinstance(result, BaseException)
+                ]
         
         # Calculate overall analysis score
         analysis_score = openai_service.calculate_analysis_score(results_dict)
         
         processing_time = time.time() - start_time
         
-        # Build comprehensive results and convert Pydantic models to dictionaries
-        def serialize_for_db(obj):
-            """Convert Pydantic models and other objects to JSON-serializable format."""
-            if hasattr(obj, 'model_dump'):
-                return obj.model_dump()
-            elif hasattr(obj, 'dict'):
-                return obj.dict()
-            elif isinstance(obj, list):
-                return [serialize_for_db(item) for item in obj]
-            elif isinstance(obj, dict):
-                return {k: serialize_for_db(v) for k, v in obj.items()}
-            else:
-                return obj
-        
-        # Only build results if we have valid data - no fallback to generic messages
-        comprehensive_results = {
+        # Only build results if we have valid data - no fallback to generic messages.
+        # Converted to JSON-compatible values (datetimes as ISO strings) in one pass, since
+        # the Supabase client encodes the update body with the stdlib json module.
+        comprehensive_results = to_jsonable_python({
             "executiveSummary": results_dict.get("executiveSummary"),  # No fallback - will be None if failed
-            "biasAnalysis": serialize_for_db(results_dict.get("biasAnalysis")),
-            "sentimentAnalysis": serialize_for_db(results_dict.get("sentimentAnalysis")),
-            "claimsExtracted": serialize_for_db(results_dict.get("claimsExtracted", [])),
-            "factCheckResults": serialize_for_db(fact_check_results),
-            "sourceCredibility": serialize_for_db(results_dict.get("sourceCredibility")),
+            "biasAnalysis": results_dict.get("biasAnalysis"),
+            "sentimentAnalysis": results_dict.get("sentimentAnalysis"),
+            "claimsExtracted": results_dict.get("claimsExtracted", []),
+            "factCheckResults": fact_check_results,
+            "sourceCredibility": results_dict.get("sourceCredibility"),
             "analysisScore": analysis_score
-        }
+        }, by_alias=False)
         
         # Update the analysis in the database with completed results
         try:
@@ -182,6 +315,15 @@ async def process_analysis_background(
 
 # --- Content Extraction Endpoints ---
 
+# Content extraction error code -> HTTP status; unknown codes map to 500
+_EXTRACTION_ERROR_STATUS = {
+    "INVALID_URL": 400,
+    "HTTP_ERROR": 502,
+    "TIMEOUT": 504,
+    "EXTRACTION_FAILED": 422,
+    "CONTENT_TOO_LARGE": 422,
+}
+
 @router.post(
     "/content/extract",
     response_model=schemas.ContentExtractionResponse,
@@ -238,6 +380,7 @@ async def extract_content(
     - Invalid URL format → Returns 400 with clear error message
     - Non-existent URLs (404) → Returns appropriate error
     - Timeout errors → Returns timeout message
+    - Pages larger than 5 MB → Returns 422 without downloading the rest
     - Extraction failures → Returns detailed error information
     """
     try:
@@ -245,16 +388,8 @@ async def extract_content(
         
         if result['status'] == 'error':
             error_info = result['error']
-            if error_info['code'] == 'INVALID_URL':
-                raise HTTPException(status_code=400, detail=error_info['message'])
-            elif error_info['code'] == 'HTTP_ERROR':
-                raise HTTPException(status_code=502, detail=error_info['message'])
-            elif error_info['code'] == 'TIMEOUT':
-                raise HTTPException(status_code=504, detail=error_info['message'])
-            elif error_info['code'] == 'EXTRACTION_FAILED':
-                raise HTTPException(status_code=422, detail=error_info['message'])
-            else:
-                raise HTTPException(status_code=500, detail=error_info['message'])
+            status_code = _EXTRACTION_ERROR_STATUS.get(error_info['code'], 500)
+            raise HTTPException(status_code=status_code, detail=error_info['message'])
         
         return schemas.ContentExtractionResponse(
             status="success",
@@ -296,7 +431,7 @@ async def delayed_background_processing(
         jwt_token=jwt_token
     )
 
-@router.post("/analyses/{analysis_id}/process", tags=["Analysis"])
+@router.post("/analyses/{analysis_id}/process", tags=["Analysis"], response_class=ORJSONResponse)
 async def trigger_analysis_processing(
     analysis_id: str,
     auth_data: dict = Depends(get_current_user_with_token)
@@ -306,7 +441,7 @@ async def trigger_analysis_processing(
     This endpoint allows forcing the processing of a pending analysis.
     """
     user = auth_data["user"]
-    user_id = getattr(user, 'id', 'user-123')
+    user_id = user.id
     
     # Get the analysis from database
     analysis_data = await database_service.get_analysis(analysis_id, user_id, auth_data["token"])
@@ -342,7 +477,7 @@ async def trigger_analysis_processing(
     )
     
     # Start background processing
-    asyncio.create_task(
+    background_service.spawn(
         process_analysis_background(
             analysis_id=analysis_id,
             user_id=user_id,
@@ -359,7 +494,7 @@ async def trigger_analysis_processing(
         "status": "success",
         "message": "Analysis processing triggered",
         "analysisId": analysis_id,
-        "timestamp": datetime.datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 @router.get("/health", response_model=schemas.HealthResponse)
@@ -384,7 +519,7 @@ async def health_check():
             "version": "1.0.0",
             "openai_status": openai_status
         },
-        "timestamp": datetime.datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 # --- v0.2 Comprehensive Analysis System ---
@@ -493,9 +628,9 @@ async def comprehensive_analysis(
     if request.options.includeExecutiveSummary:
         tasks["executiveSummary"] = openai_service.get_executive_summary(content, request.preset)
     
-    # Execute tasks concurrently
+    # Execute tasks concurrently; the first unexpected failure cancels the rest
     if tasks:
-        results_values = await asyncio.gather(*tasks.values())
+        results_values = await _run_all(tasks.values())
         results_dict = dict(zip(tasks.keys(), results_values))
     else:
         results_dict = {}
@@ -515,7 +650,8 @@ async def comprehensive_analysis(
                 openai_service.fact_check_claim(claim.statement, claim.id) 
                 for claim in claims[:5]  # Limit to first 5 claims for performance
             ]
-            fact_check_results = await asyncio.gather(*fact_check_tasks)
+            # Separate group, so fact-check failures cannot cancel the primary analyses
+            fact_check_results = await _run_all(fact_check_tasks)
             # Filter out failed fact-check results
             fact_check_results = [result for result in fact_check_results if result is not None]
     
@@ -524,8 +660,8 @@ async def comprehensive_analysis(
     
     processing_time = time.time() - start_time
     
-    # Build comprehensive results
-    comprehensive_results = schemas.ComprehensiveAnalysisResults(
+    # Build comprehensive results (sections are already-validated openai_service outputs)
+    comprehensive_results = schemas.ComprehensiveAnalysisResults.model_construct(
         executiveSummary=results_dict.get("executiveSummary"),  # No fallback
         biasAnalysis=results_dict.get("biasAnalysis"),
         sentimentAnalysis=results_dict.get("sentimentAnalysis"),
@@ -535,10 +671,10 @@ async def comprehensive_analysis(
         analysisScore=analysis_score
     )
     
-    metadata = schemas.AnalysisMetadata(
+    metadata = schemas.AnalysisMetadata.model_construct(
         processingTime=round(processing_time, 2),
         preset=request.preset,
-        wordsAnalyzed=len(content.split()),
+        wordsAnalyzed=count_words(content),
         createdAt=datetime.datetime.utcnow()
     )
     
@@ -552,7 +688,7 @@ async def comprehensive_analysis(
             "results": comprehensive_results,
             "metadata": metadata
         },
-        "timestamp": datetime.datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 # --- Source Credibility Assessment ---
@@ -570,11 +706,8 @@ async def assess_source_credibility(
     Assess the credibility of a news source or website URL.
     Provides detailed scoring across multiple credibility factors.
     """
-    try:
-        result = await openai_service.assess_source_credibility(request.url)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Credibility assessment failed: {str(e)}")
+    result = await openai_service.assess_source_credibility(request.url)
+    return result
 
 # --- Enhanced Analysis History ---
 
@@ -725,11 +858,11 @@ async def get_analysis_history(
     if end_index < total_count:
         next_cursor = "next-cursor"  # In real implementation, encode the next position
     
-    return {
-        "items": items,
-        "nextCursor": next_cursor,
-        "totalCount": total_count
-    }
+    return schemas.PaginatedAnalysisHistoryResponse.model_construct(
+        items=items,
+        nextCursor=next_cursor,
+        totalCount=total_count
+    )
 
 # --- Export & Share Functionality ---
 
@@ -752,7 +885,7 @@ async def export_analysis(
     filename = f"analysis-{analysis_id}.{request.format}"
     mock_url = f"https://api.critiquewire.com/exports/{filename}"
     
-    return schemas.ExportResponse(
+    return schemas.ExportResponse.model_construct(
         downloadUrl=mock_url,
         filename=filename,
         fileSize=1024000,  # 1MB mock size
@@ -780,7 +913,7 @@ async def share_analysis(
     
     expiration_time = datetime.datetime.utcnow() + datetime.timedelta(seconds=request.expiresIn)
     
-    return schemas.ShareResponse(
+    return schemas.ShareResponse.model_construct(
         shareUrl=share_url,
         shareId=share_id,
         expiresAt=expiration_time,
@@ -789,6 +922,11 @@ async def share_analysis(
 
 # --- Analysis Presets Management ---
 
+# Per-user preset lists: user_id -> (expires_at, presets)
+_PRESETS_CACHE_TTL = 30
+_PRESETS_CACHE_MAX_USERS = 1024
+_presets_cache: Dict[Optional[str], Tuple[float, List[schemas.AnalysisPreset]]] = {}
+
 @router.get(
     "/analysis-presets",
     response_model=List[schemas.AnalysisPreset],
@@ -799,6 +937,11 @@ async def get_analysis_presets(user: dict = Depends(get_current_user)):
     Retrieve all available analysis presets for the user.
     Includes both default system presets and custom user presets.
     """
+    user_id = user.id
+    cached = _presets_cache.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
     # TODO: Implement actual preset retrieval from database
     # For now, return default presets plus any custom presets
     now = datetime.datetime.utcnow()
@@ -853,7 +996,6 @@ async def get_analysis_presets(user: dict = Depends(get_current_user)):
     
     # TODO: In a real implementation, fetch custom presets from database
     # For now, include a mock custom preset to demonstrate functionality
-    user_id = getattr(user, 'id', None)
     custom_presets = [
         schemas.AnalysisPreset(
             id="a43c74cf-7f0c-4ee3-8afa-8b468250d17e",  # Mock custom preset ID
@@ -879,6 +1021,11 @@ async def get_analysis_presets(user: dict = Depends(get_current_user)):
     # Combine default and custom presets
     all_presets = default_presets + custom_presets
     
+    _presets_cache.pop(user_id, None)
+    if len(_presets_cache) >= _PRESETS_CACHE_MAX_USERS:
+        del _presets_cache[next(iter(_presets_cache))]
+    _presets_cache[user_id] = (time.monotonic() + _PRESETS_CACHE_TTL, all_presets)
+    
     return all_presets
 
 @router.post(
@@ -901,9 +1048,12 @@ async def create_analysis_preset(
         
         # Get user ID from the Supabase user object
         # The user object from Supabase has an 'id' field, not 'user_id'
-        user_id = getattr(user, 'id', None)
+        user_id = user.id
+        
+        # The user's preset list changed, so drop their cached copy
+        _presets_cache.pop(user_id, None)
         
-        return schemas.AnalysisPreset(
+        return schemas.AnalysisPreset.model_construct(
             id=preset_id,
             name=request.name,
             description=request.description,
@@ -916,8 +1066,7 @@ async def create_analysis_preset(
             updatedAt=datetime.datetime.utcnow()
         )
     except Exception as e:
-        # Log the error for debugging
-        print(f"Error creating preset: {e}")
+        logger.exception("create_preset_failed")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create preset: {str(e)}"
@@ -1009,21 +1158,22 @@ async def analyze_article_sync(
                 "status": "completed",
                 "results": {},
                 "metadata": {
-                    "analyzedAt": datetime.datetime.utcnow().isoformat(),
+                    "analyzedAt": iso_now(),
                     "processingTime": 0,
                     "modelVersion": openai_service.model,
                 }
             },
-            "timestamp": datetime.datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
 
-    results_values = await asyncio.gather(*tasks.values())
+    results_values = await _run_all(tasks.values())
     results_dict = dict(zip(tasks.keys(), results_values))
 
     processing_time = time.time() - start_time
 
-    # Construct the final results object using the refined schema
-    final_results = schemas.AnalysisResultTypes(**results_dict)
+    # Construct the final results object using the refined schema. Every value was already
+    # validated by openai_service, so skip re-running the validators.
+    final_results = schemas.AnalysisResultTypes.model_construct(**results_dict)
 
     return {
         "status": "success",
@@ -1032,12 +1182,12 @@ async def analyze_article_sync(
             "status": "completed",
             "results": final_results,
             "metadata": {
-                "analyzedAt": datetime.datetime.utcnow().isoformat(),
+                "analyzedAt": iso_now(),
                 "processingTime": round(processing_time, 2),
                 "modelVersion": openai_service.model,
             }
         },
-        "timestamp": datetime.datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 @router.post("/analysis/article", response_model=schemas.AnalysisStatusResponse)
@@ -1057,7 +1207,7 @@ async def analyze_article(
             "status": "processing",
             "estimatedTime": 60
         },
-        "timestamp": datetime.datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 @router.get("/analysis/{analysis_id}", response_model=schemas.AnalysisResultsResponseLegacy)
@@ -1098,7 +1248,7 @@ async def get_analysis_results(
                 "wordsAnalyzed": 500
             }
         },
-        "timestamp": datetime.datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 @router.get("/analyses/{analysis_id}", response_model=schemas.AnalysisResultsResponse)
@@ -1112,7 +1262,7 @@ async def get_unified_analysis_results(
     """
     user = auth_data["user"]
     jwt_token = auth_data["token"]
-    user_id = getattr(user, 'id', 'user-123')
+    user_id = user.id
     
     # Retrieve analysis from database
     analysis_data = await database_service.get_analysis(analysis_id, user_id, jwt_token)
@@ -1154,7 +1304,7 @@ async def get_user_profile(user: dict = Depends(get_current_user)):
     """
     # Placeholder implementation
     return {
-        "id": getattr(user, 'id', 'user-123'),
+        "id": user.id,
         "username": getattr(user, 'email', 'testuser').split('@')[0],
         "fullName": "Test User",
         "avatarUrl": "https://example.com/avatar.jpg",
@@ -1168,7 +1318,7 @@ async def update_user_profile(request: schemas.UpdateUserProfileRequest, user: d
     """
     # Placeholder implementation
     return {
-        "id": getattr(user, 'id', 'user-123'),
+        "id": user.id,
         "username": request.username or getattr(user, 'email', 'testuser').split('@')[0],
         "fullName": request.fullName or "Test User",
         "avatarUrl": request.avatarUrl or "https://example.com/avatar.jpg",
@@ -1230,13 +1380,11 @@ async def unified_analysis(
     Unified analysis endpoint that handles both comprehensive and legacy analysis types.
     Supports both async and sync modes based on the request configuration.
     """
-    import asyncio  # Import asyncio at the function level for both sync and async paths
-    
     start_time = time.time()
     
     user = auth_data["user"]
     jwt_token = auth_data["token"]
-    user_id = getattr(user, 'id', 'user-123')
+    user_id = user.id
     
     # Validate input
     if not request.url and not request.content:
@@ -1264,17 +1412,8 @@ async def unified_analysis(
     analysis_id = str(uuid.uuid4())
     
     # Convert options to analysis types list
-    analysis_types = []
-    if request.options.includeBiasAnalysis:
-        analysis_types.append("bias")
-    if request.options.includeSentimentAnalysis:
-        analysis_types.append("sentiment")
-    if request.options.includeFactCheck:
-        analysis_types.append("factCheck")
-    if request.options.includeClaimExtraction:
-        analysis_types.append("claimExtraction")
-    if request.options.includeExecutiveSummary:
-        analysis_types.append("executiveSummary")
+    selected_options = request.options.__dict__
+    analysis_types = [name for option, name in _ANALYSIS_TYPE_MAP if selected_options[option]]
     
     # If async mode is requested, return immediately with task status
     if request.async_mode:
@@ -1293,7 +1432,7 @@ async def unified_analysis(
         )
         
         # Start background processing with a small delay to simulate realistic processing
-        asyncio.create_task(
+        background_service.spawn(
             delayed_background_processing(
                 analysis_id=analysis_id,
                 user_id=user_id,
@@ -1306,25 +1445,18 @@ async def unified_analysis(
             )
         )
         
-        return {
-            "status": "success",
-            "data": {
-                "analysisId": analysis_id,
-                "articleId": article_id,
-                "analysisType": analysis_type,
-                "status": "pending",
-                "results": None,
-                "metadata": schemas.AnalysisMetadata(
-                    processingTime=0,
-                    preset=request.preset,
-                    wordsAnalyzed=len(content.split()),
-                    createdAt=datetime.datetime.utcnow()
-                )
-            },
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
+        return _pending_analysis_response(analysis_id, article_id, analysis_type, request.preset, content)
+    
+    # Sync mode - perform analysis immediately and stream each section as it completes
+    
+    # Serve a recent identical analysis without calling OpenAI again
+    cache_key = analysis_cache_service.make_key(content, request.preset, request.options.model_dump_json())
+    cached_results = analysis_cache_service.get(cache_key)
+    if cached_results is not None:
+        return _cached_analysis_response(
+            analysis_id, article_id, analysis_type, cached_results, request.preset, content, start_time
+        )
     
-    # Sync mode - perform analysis immediately
     # Build analysis tasks based on options
     tasks = {}
     
@@ -1338,7 +1470,7 @@ async def unified_analysis(
         tasks["claimsExtracted"] = openai_service.extract_claims(content, request.preset)
     
     if request.options.includeFactCheck:
-        # Will be handled after claim extraction
+        # Will be started as soon as claim extraction completes
         pass
     
     if request.options.includeSourceCredibility and request.url:
@@ -1347,69 +1479,113 @@ async def unified_analysis(
     if request.options.includeExecutiveSummary:
         tasks["executiveSummary"] = openai_service.get_executive_summary(content, request.preset)
     
-    # Execute tasks concurrently
-    if tasks:
-        results_values = await asyncio.gather(*tasks.values())
-        results_dict = dict(zip(tasks.keys(), results_values))
-    else:
-        results_dict = {}
-    
-    # Check if we got any valid results from OpenAI
-    valid_results = [v for v in results_dict.values() if v is not None]
-    if not valid_results and tasks:
-        # All OpenAI calls failed, raise error instead of returning generic results
-        raise HTTPException(status_code=500, detail="Analysis failed - OpenAI services unavailable")
-    
-    # Handle fact-checking after claim extraction
-    fact_check_results = []
-    if request.options.includeFactCheck and "claimsExtracted" in results_dict:
-        claims = results_dict.get("claimsExtracted", [])
-        if claims:
-            fact_check_tasks = [
-                openai_service.fact_check_claim(claim.statement, claim.id) 
-                for claim in claims[:5]  # Limit to first 5 claims for performance
-            ]
-            fact_check_results = await asyncio.gather(*fact_check_tasks)
-            # Filter out failed fact-check results
-            fact_check_results = [result for result in fact_check_results if result is not None]
-    
-    # Calculate overall analysis score
-    analysis_score = openai_service.calculate_analysis_score(results_dict)
-    
-    processing_time = time.time() - start_time
-    
-    # Build comprehensive results
-    comprehensive_results = schemas.ComprehensiveAnalysisResults(
-        executiveSummary=results_dict.get("executiveSummary"),  # No fallback
-        biasAnalysis=results_dict.get("biasAnalysis"),
-        sentimentAnalysis=results_dict.get("sentimentAnalysis"),
-        claimsExtracted=results_dict.get("claimsExtracted", []),
-        factCheckResults=fact_check_results,
-        sourceCredibility=results_dict.get("sourceCredibility"),
-        analysisScore=analysis_score
-    )
+    pending = [asyncio.ensure_future(_keyed(key, coro)) for key, coro in tasks.items()]
+    remaining = asyncio.as_completed(pending)
+    results_dict = {}
+    fact_check_future = None
+    
+    def record_section(key, value):
+        nonlocal fact_check_future
+        results_dict[key] = value
+        # Fact-checking only depends on the extracted claims, so start it right away
+        if key == "claimsExtracted" and value and request.options.includeFactCheck:
+            fact_check_future = asyncio.ensure_future(asyncio.gather(*[
+                openai_service.fact_check_claim(claim.statement, claim.id)
+                for claim in value[:5]  # Limit to first 5 claims for performance
+            ], return_exceptions=True))
+    
+    def cancel_outstanding():
+        for task in pending:
+            task.cancel()
+        if fact_check_future:
+            fact_check_future.cancel()
+    
+    # Wait for the first usable section before committing to a 200 response, so that
+    # a complete OpenAI outage is still reported as an HTTP error
+    try:
+        for next_done in remaining:
+            try:
+                key, value = await next_done
+            except Exception:
+                # Treated like a section that returned None; stream_results emits it as null
+                logger.warning("Analysis section failed for analysis %s", analysis_id, exc_info=True)
+                continue
+            record_section(key, value)
+            if value is not None:
+                break
+        else:
+            if tasks:
+                # All OpenAI calls failed or raised - fall back to the last successful result if we have one
+                stale_results = analysis_cache_service.get(cache_key, allow_stale=True)
+                if stale_results is not None:
+                    return _cached_analysis_response(
+                        analysis_id, article_id, analysis_type, stale_results, request.preset, content, start_time,
+                        stale=True
+                    )
+                raise HTTPException(status_code=500, detail="Analysis failed - OpenAI services unavailable")
+    except BaseException:
+        cancel_outstanding()
+        raise
     
-    metadata = schemas.AnalysisMetadata(
-        processingTime=round(processing_time, 2),
-        preset=request.preset,
-        wordsAnalyzed=len(content.split()),
-        createdAt=datetime.datetime.utcnow()
-    )
+    async def stream_results():
+        members = []
+        
+        def add_member(key, value):
+            member = _json_member(key, value)
+            members.append(member)
+            return member if len(members) == 1 else b"," + member
+        
+        try:
+            yield _completed_analysis_prefix(analysis_id, article_id, analysis_type) + b"{"
+            for key, value in list(results_dict.items()):
+                yield add_member(key, value)
+            
+            # The 200 status is already sent, so a section that raises from here on is
+            # emitted as null instead of truncating the JSON body
+            for next_done in remaining:
+                try:
+                    key, value = await next_done
+                except Exception:
+                    logger.warning("Analysis section failed for analysis %s", analysis_id, exc_info=True)
+                    continue
+                record_section(key, value)
+                yield add_member(key, value)
+            for key in tasks:
+                if key not in results_dict:
+                    record_section(key, None)
+                    yield add_member(key, None)
+            
+            fact_check_results = []
+            if fact_check_future:
+                try:
+                    # Filter out failed fact-check results
+                    fact_check_results = [
+                        result for result in await fact_check_future
+                        if result is not None and not isinstance(result, BaseException)
+                    ]
+                except Exception:
+                    logger.warning("Fact-checking failed for analysis %s", analysis_id, exc_info=True)
+            yield add_member("factCheckResults", fact_check_results)
+            
+            for key, default in _COMPREHENSIVE_RESULT_DEFAULTS.items():
+                if key not in results_dict:
+                    yield add_member(key, default)
+            
+            # Calculate overall analysis score
+            analysis_score = openai_service.calculate_analysis_score(results_dict)
+            yield add_member("analysisScore", analysis_score) + b"}"
+            
+            # A section that failed would otherwise be served as a fresh null until the entry expires
+            if all(results_dict.get(key) is not None for key in tasks):
+                analysis_cache_service.set(cache_key, b"{" + b",".join(members) + b"}")
+            
+            yield _completed_analysis_suffix(request.preset, content, start_time)
+        finally:
+            cancel_outstanding()
     
-    return {
-        "status": "success",
-        "data": {
-            "analysisId": analysis_id,
-            "articleId": article_id,
-            "analysisType": analysis_type,
-            "status": "completed",
-            "results": comprehensive_results,
-            "metadata": metadata
-        },
-        "timestamp": datetime.datetime.utcnow().isoformat()
-    }
+    return StreamingResponse(stream_results(), media_type="application/json")
 
-@router.post("/analyses/{analysis_id}/test-complete", tags=["Analysis"])
+@router.post("/analyses/{analysis_id}/test-complete", tags=["Analysis"], response_class=ORJSONResponse)
 async def test_complete_analysis(
     analysis_id: str,
     auth_data: dict = Depends(get_current_user_with_token)
@@ -1419,7 +1595,7 @@ async def test_complete_analysis(
     This helps debug database update issues.
     """
     user = auth_data["user"]
-    user_id = getattr(user, 'id', 'user-123')
+    user_id = user.id
     
     # Simple mock results that should be JSON serializable
     mock_results = {
@@ -1446,15 +1622,13 @@ async def test_complete_analysis(
                 "status": "success",
                 "message": "Analysis marked as completed (test)",
                 "analysisId": analysis_id,
-                "timestamp": datetime.datetime.utcnow().isoformat()
+                "timestamp": iso_now()
             }
         else:
             raise HTTPException(status_code=500, detail="Failed to update analysis status")
             
     except Exception as e:
-        print(f"[ERROR] Test complete failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("test_complete_failed analysis_id=%s", analysis_id)
         raise HTTPException(status_code=500, detail=f"Database update error: {str(e)}")
 
 # --- RSS News Feed Endpoints ---
@@ -1485,27 +1659,25 @@ async def get_news_feed(
     - **search**: Search term for title and summary
     - **language**: Filter by language (ar, fr, en, unknown)
     """
-    try:
-        from app.services.rss_collection_service import rss_collection_service
-        
-        result = await rss_collection_service.get_news_feed(
-            page=page,
-            limit=limit,
-            rss_only=rss_only,
-            source=source,
-            search=search,
-            language=language
-        )
-        
-        return {
-            "status": "success",
-            "data": result,
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting news feed: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get news feed: {str(e)}")
+    result = await rss_collection_service.get_news_feed(
+        page=page,
+        limit=limit,
+        rss_only=rss_only,
+        source=source,
+        search=search,
+        language=language
+    )
+    
+    # Articles were already validated by the service; encode the page straight to bytes
+    envelope = schemas.NewsFeedResponse.model_construct(
+        status="success",
+        data=schemas.NewsFeedData.model_construct(
+            articles=result["articles"],
+            pagination=schemas.NewsFeedPagination.model_construct(**result["pagination"])
+        ),
+        timestamp=iso_now()
+    )
+    return Response(content=schemas.NEWS_FEED_RESPONSE_ADAPTER.dump_json(envelope), media_type="application/json")
 
 @router.post(
     "/news-feed/articles/{article_id}/extract-content",
@@ -1527,25 +1699,16 @@ async def extract_rss_article_content(
     3. Updates the article with the extracted content and images
     4. Returns the extracted content
     """
-    try:
-        from app.services.rss_collection_service import rss_collection_service
-        
-        result = await rss_collection_service.extract_article_content(article_id)
-        
-        if not result:
-            raise HTTPException(status_code=404, detail="Article not found or content extraction failed")
-        
-        return {
-            "status": "success",
-            "data": result,
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error extracting content for article {article_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Content extraction failed: {str(e)}")
+    result = await rss_collection_service.extract_article_content(article_id)
+    
+    if not result:
+        raise HTTPException(status_code=404, detail="Article not found or content extraction failed")
+    
+    return {
+        "status": "success",
+        "data": result,
+        "timestamp": iso_now()
+    }
 
 @router.post(
     "/news-feed/articles/{article_id}/analyze",
@@ -1568,113 +1731,144 @@ async def analyze_rss_article(
     3. Starts the analysis process
     4. Returns analysis results or status
     """
-    try:
-        user = auth_data["user"]
-        user_id = getattr(user, 'id', 'user-123')
-        jwt_token = auth_data["token"]
-        
-        # Get article from database
-        result = database_service.supabase.table("articles").select("*").eq("id", article_id).execute()
-        
-        if not result.data:
-            raise HTTPException(status_code=404, detail="Article not found")
-        
-        article = result.data[0]
-        
-
-        
-        # Use article content or extract if needed
-        content = article['content']
-        
-        # If content is just the title placeholder, extract full content
-        if content and "(Click to read full article)" in content:
-            from app.services.rss_collection_service import rss_collection_service
-            extracted = await rss_collection_service.extract_article_content(article_id)
-            if extracted:
-                content = extracted['content']
-        
-        if not content or len(content.strip()) < 100:
-            raise HTTPException(status_code=400, detail="Article content too short for analysis")
-        
-        analysis_id = str(uuid.uuid4())
-        
-        # Convert options to analysis types list
-        analysis_types = []
-        if request.options.includeBiasAnalysis:
-            analysis_types.append("bias")
-        if request.options.includeSentimentAnalysis:
-            analysis_types.append("sentiment")
-        if request.options.includeFactCheck:
-            analysis_types.append("factCheck")
-        if request.options.includeClaimExtraction:
-            analysis_types.append("claimExtraction")
-        if request.options.includeExecutiveSummary:
-            analysis_types.append("executiveSummary")
-        
-        # Store initial analysis record
-        analysis_created = await database_service.create_analysis(
+    user = auth_data["user"]
+    user_id = user.id
+    jwt_token = auth_data["token"]
+    
+    # Convert options to analysis types list
+    selected_options = request.options.__dict__
+    analysis_types = [name for option, name in _ANALYSIS_TYPE_MAP if selected_options[option]]
+    
+    # Reject requests that would start an analysis with nothing to run, before any I/O
+    if not analysis_types and not request.options.includeSourceCredibility:
+        raise HTTPException(status_code=400, detail="At least one analysis option must be enabled")
+    
+    # Get article from database
+    article = await database_service.get_article_for_analysis(article_id)
+    
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    
+    # Use article content or extract if needed
+    content = article['content']
+    
+    # Articles are stored with a title placeholder until their full content is extracted
+    if article['content_extracted_at'] is None:
+        extracted = await rss_collection_service.extract_article_content(article_id)
+        if extracted:
+            content = extracted['content']
+    
+    if not content or len(content.strip()) < 100:
+        raise HTTPException(status_code=400, detail="Article content too short for analysis")
+    
+    analysis_id = str(uuid.uuid4())
+    
+    # Store initial analysis record and mark the article as pending in one round-trip
+    analysis_created = await database_service.create_analysis_and_mark_article(
+        analysis_id=analysis_id,
+        user_id=user_id,
+        content=content,
+        analysis_types=analysis_types,
+        preset=request.preset,
+        article_id=article_id,
+        jwt_token=jwt_token,
+        title=article['title'],
+        url=article['url']
+    )
+    
+    if not analysis_created:
+        raise HTTPException(status_code=500, detail="Failed to create analysis record")
+    
+    # Start background processing
+    background_service.spawn(
+        process_analysis_background(
             analysis_id=analysis_id,
             user_id=user_id,
             content=content,
             analysis_types=analysis_types,
-            content_type="url",  # Fixed: should be "url" not "article"
             preset=request.preset,
-            jwt_token=jwt_token,
-            title=article['title'],
+            options=request.options,
             url=article['url'],
-            article_id=article_id
+            jwt_token=jwt_token
         )
-        
-        if not analysis_created:
-            raise HTTPException(status_code=500, detail="Failed to create analysis record")
-        
-        # Update article analysis status after analysis record is created
+    )
+    
+    return _pending_analysis_response(analysis_id, article_id, "url", request.preset, content)
+
+# Server-Sent Events stream of an article's analysis status
+_ANALYSIS_STREAM_KEEPALIVE = 30
+_ANALYSIS_STREAM_TIMEOUT = 600
+_TERMINAL_ANALYSIS_STATUSES = frozenset(("completed", "failed"))
+
+def _sse_event(payload) -> bytes:
+    """Encode one Server-Sent Events `data:` message."""
+    return b"data: " + to_json(payload) + b"\n\n"
+
+@router.get(
+    "/news-feed/articles/{article_id}/analyze/stream",
+    tags=["News Feed"],
+    summary="Stream RSS article analysis status",
+    description="Server-Sent Events stream that sends the article's analysis once now and again when it completes or fails"
+)
+async def stream_rss_article_analysis(
+    article_id: str,
+    auth_data: dict = Depends(get_current_user_with_token),
+):
+    """
+    Stream the status of an article's latest analysis.
+    
+    Each event carries the same `data` object as GET /analyses/{analysis_id}. The stream
+    closes after the analysis reaches `completed` or `failed`. Instead of the client
+    polling, the analysis is re-read when its background processing ends, with a
+    keepalive (and re-read) every 30 seconds for analyses processed by another worker.
+    """
+    user = auth_data["user"]
+    user_id = user.id
+    jwt_token = auth_data["token"]
+    
+    article = await database_service.get_article_for_analysis(article_id)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    
+    analysis_id = article['analysis_id']
+    if not analysis_id:
+        raise HTTPException(status_code=404, detail="Article has not been analyzed")
+    
+    async def analysis_events():
+        # Subscribe before the first read so a completion in between is not missed
+        queue = background_service.subscribe(analysis_id)
         try:
-            database_service.supabase.table("articles").update({
-                "analysis_status": "pending",
-                "analysis_id": analysis_id
-            }).eq("id", article_id).execute()
-        except Exception as e:
-            logger.error(f"Failed to update article analysis status: {e}")
-            # Don't fail the request if this update fails
-        
-        # Start background processing
-        asyncio.create_task(
-            process_analysis_background(
-                analysis_id=analysis_id,
-                user_id=user_id,
-                content=content,
-                analysis_types=analysis_types,
-                preset=request.preset,
-                options=request.options,
-                url=article['url'],
-                jwt_token=jwt_token
-            )
-        )
-        
-        return {
-            "status": "success",
-            "data": {
-                "analysisId": analysis_id,
-                "articleId": article_id,
-                "analysisType": "url",  # Fixed: should be "url" not "article"
-                "status": "pending",
-                "results": None,
-                "metadata": schemas.AnalysisMetadata(
-                    processingTime=0,
-                    preset=request.preset,
-                    wordsAnalyzed=len(content.split()),
-                    createdAt=datetime.datetime.utcnow()
-                )
-            },
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error analyzing article {article_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+            deadline = time.monotonic() + _ANALYSIS_STREAM_TIMEOUT
+            last_status = None
+            while True:
+                analysis = await database_service.get_analysis(analysis_id, user_id, jwt_token)
+                if not analysis:
+                    yield _sse_event({"analysisId": analysis_id, "status": "not_found"})
+                    return
+                
+                data = analysis["data"]
+                if data["status"] != last_status:
+                    last_status = data["status"]
+                    yield _sse_event(data)
+                if last_status in _TERMINAL_ANALYSIS_STATUSES or time.monotonic() >= deadline:
+                    return
+                
+                try:
+                    await asyncio.wait_for(queue.get(), timeout=_ANALYSIS_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            background_service.unsubscribe(analysis_id, queue)
+    
+    return StreamingResponse(
+        analysis_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Encoded RSSSourcesData: (expires_at, JSON bytes)
+_RSS_SOURCES_CACHE_TTL = 60
+_rss_sources_cache: Tuple[float, bytes] = (0.0, b"")
 
 @router.get(
     "/news-feed/sources",
@@ -1685,23 +1879,16 @@ async def analyze_rss_article(
 )
 async def get_rss_sources(user: dict = Depends(get_current_user)):
     """Get list of available RSS sources."""
-    try:
-        from app.services.rss_collection_service import rss_collection_service
-        
+    global _rss_sources_cache
+    expires_at, data = _rss_sources_cache
+    if time.monotonic() >= expires_at:
         sources = rss_collection_service.get_available_sources()
-        
-        return {
-            "status": "success",
-            "data": {
-                "sources": sources,
-                "total": len(sources)
-            },
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting RSS sources: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get sources: {str(e)}")
+        data = to_json(schemas.RSSSourcesData.model_construct(sources=sources, total=len(sources)))
+        _rss_sources_cache = (time.monotonic() + _RSS_SOURCES_CACHE_TTL, data)
+    
+    # Only the timestamp changes between requests; the data member is reused as-is
+    body = b'{"status":"success","timestamp":' + to_json(iso_now()) + b',"data":' + data + b"}"
+    return Response(content=body, media_type="application/json")
 
 # Admin endpoints for RSS management
 @router.post(
@@ -1713,40 +1900,27 @@ async def get_rss_sources(user: dict = Depends(get_current_user)):
 )
 async def trigger_rss_collection(user: dict = Depends(get_current_user)):
     """Manually trigger RSS collection from all feeds."""
-    try:
-        from app.services.rss_collection_service import rss_collection_service
-        
-        stats = await rss_collection_service.collect_all_feeds()
-        
-        return {
-            "status": "success",
-            "data": stats,
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in RSS collection: {e}")
-        raise HTTPException(status_code=500, detail=f"RSS collection failed: {str(e)}")
+    stats = await rss_collection_service.collect_all_feeds()
+    
+    return schemas.RSSCollectionResponse.model_construct(
+        status="success",
+        data=schemas.RSSCollectionStats.model_construct(**stats),
+        timestamp=iso_now()
+    )
 
 @router.get(
     "/admin/scheduler/status",
+    response_class=ORJSONResponse,
     tags=["Admin"],
     summary="Get scheduler status",
     description="Get status of background scheduler jobs"
 )
 async def get_scheduler_status(user: dict = Depends(get_current_user)):
     """Get status of background scheduler."""
-    try:
-        from app.services.scheduler_service import scheduler_service
-        
-        status = scheduler_service.get_job_status()
-        
-        return {
-            "status": "success",
-            "data": status,
-            "timestamp": datetime.datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting scheduler status: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get scheduler status: {str(e)}") 
\ No newline at end of file
+    status = scheduler_service.get_job_status()
+    
+    return {
+        "status": "success",
+        "data": status,
+        "timestamp": iso_now()
+    }
\ No newline at end of file
@@ -1,25 +1,70 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Literal, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from pydantic.dataclasses import dataclass
+from typing import Annotated, List, Optional, Literal, Union
 import datetime
 
+from app.utils.clock import iso_now
+
+# Shared Literal types, declared once and reused by every model that accepts them
+PresetLiteral = Literal["general", "political", "financial", "scientific", "opinion"]
+AnalysisTypeLiteral = Literal["url", "text"]
+AnalysisStatusLiteral = Literal["pending", "completed", "failed"]
+ProcessingStatusLiteral = Literal["processing", "completed", "failed"]
+SuccessLiteral = Literal["success"]
+
+# Shared score ranges
+Score01 = Annotated[float, Field(ge=0, le=1)]
+Score0to100 = Annotated[float, Field(ge=0, le=100)]
+
+# Config for models that are only ever built and serialized, never mutated
+RESPONSE_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
 # Common
+class ResultModel(BaseModel):
+    """Base for analysis results parsed from OpenAI output; immutable once validated."""
+    model_config = RESPONSE_CONFIG
+
 class ResponseModel(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     status: str
     timestamp: str
 
+class ErrorDetail(BaseModel):
+    code: str
+    message: str
+    details: Optional[dict] = None
+
 class ErrorResponse(ResponseModel):
     status: Literal["error"] = "error"
-    error: dict
+    error: ErrorDetail
 
 # Health Check
 class HealthData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     status: str
     version: str
 
 class HealthResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: HealthData
 
+# --- Enhanced Analysis Options (v0.2) ---
+
+class AnalysisOptions(BaseModel):
+    includeBiasAnalysis: bool = Field(default=True, description="Include bias analysis")
+    includeSentimentAnalysis: bool = Field(default=True, description="Include sentiment analysis")
+    includeFactCheck: bool = Field(default=True, description="Include fact checking")
+    includeClaimExtraction: bool = Field(default=True, description="Include claim extraction")
+    includeSourceCredibility: bool = Field(default=False, description="Include source credibility assessment")
+    includeExecutiveSummary: bool = Field(default=True, description="Include executive summary")
+    # Legacy options for backward compatibility
+    includeContextAnalysis: bool = Field(default=False, description="Include context analysis")
+    includeSummary: bool = Field(default=False, description="Include summary")
+    includeExpertOpinion: bool = Field(default=False, description="Include expert opinion")
+    includeImpactAssessment: bool = Field(default=False, description="Include impact assessment")
+
 # --- v0.2 Analysis Presets ---
 
 class AnalysisPreset(BaseModel):
@@ -30,7 +75,7 @@ class AnalysisPreset(BaseModel):
     isDefault: bool = Field(..., description="Is default preset")
     isCustom: bool = Field(..., description="Is custom preset")
     createdBy: Optional[str] = Field(None, description="Created by user ID")
-    options: "AnalysisOptions" = Field(..., description="Analysis options")
+    options: AnalysisOptions = Field(..., description="Analysis options")
     createdAt: datetime.datetime
     updatedAt: datetime.datetime
 
@@ -38,92 +83,85 @@ class CreatePresetRequest(BaseModel):
     name: str = Field(..., description="Preset name")
     description: str = Field(..., description="Preset description")
     prompt: str = Field(..., description="Analysis prompt")
-    options: "AnalysisOptions" = Field(..., description="Analysis options")
-
-# --- Enhanced Analysis Options (v0.2) ---
+    options: AnalysisOptions = Field(..., description="Analysis options")
 
-class AnalysisOptions(BaseModel):
-    includeBiasAnalysis: bool = Field(default=True, description="Include bias analysis")
-    includeSentimentAnalysis: bool = Field(default=True, description="Include sentiment analysis")
-    includeFactCheck: bool = Field(default=True, description="Include fact checking")
-    includeClaimExtraction: bool = Field(default=True, description="Include claim extraction")
-    includeSourceCredibility: bool = Field(default=False, description="Include source credibility assessment")
-    includeExecutiveSummary: bool = Field(default=True, description="Include executive summary")
-    # Legacy options for backward compatibility
-    includeContextAnalysis: bool = Field(default=False, description="Include context analysis")
-    includeSummary: bool = Field(default=False, description="Include summary")
-    includeExpertOpinion: bool = Field(default=False, description="Include expert opinion")
-    includeImpactAssessment: bool = Field(default=False, description="Include impact assessment")
-
-# --- v0.3 Unified Analysis Request ---
-
-class UnifiedAnalyzeRequest(BaseModel):
-    url: Optional[str] = Field(None, description="The URL of the article to analyze. Either url or content must be provided.")
-    content: Optional[str] = Field(None, description="The raw text content to analyze. Either url or content must be provided.")
-    title: str = Field(..., description="The title of the content being analyzed")
-    preset: Literal["general", "political", "financial", "scientific", "opinion"] = Field(
+class _AnalysisRequestBase(BaseModel):
+    preset: PresetLiteral = Field(
         default="general", 
         description="The analysis preset to use, which determines focus areas and analysis depth"
     )
-    options: AnalysisOptions = Field(default_factory=AnalysisOptions)
-    async_mode: bool = Field(
-        default=True, 
-        description="Whether to process the analysis asynchronously (True) or synchronously (False)"
-    )
+    options: AnalysisOptions = Field(default_factory=AnalysisOptions, description="Analysis options")
 
 # --- v0.2 Comprehensive Analysis Request ---
 
-class ComprehensiveAnalyzeRequest(BaseModel):
+class ComprehensiveAnalyzeRequest(_AnalysisRequestBase):
     url: Optional[str] = Field(None, description="The URL of the article to analyze. Either url or content must be provided.")
     content: Optional[str] = Field(None, description="The raw text content to analyze. Either url or content must be provided.")
     title: str = Field(..., description="The title of the content being analyzed")
-    preset: Literal["general", "political", "financial", "scientific", "opinion"] = Field(
-        default="general", 
-        description="The analysis preset to use, which determines focus areas and analysis depth"
+
+# --- v0.3 Unified Analysis Request ---
+
+class UnifiedAnalyzeRequest(ComprehensiveAnalyzeRequest):
+    async_mode: bool = Field(
+        default=True, 
+        description="Whether to process the analysis asynchronously (True) or synchronously (False)"
     )
-    options: AnalysisOptions = Field(default_factory=AnalysisOptions)
 
 # --- v0.2 Enhanced Analysis Result Schemas ---
 
-class SentimentAnalysisResult(BaseModel):
+# Leaf rows that only ever appear in lists inside a model are frozen, slotted pydantic
+# dataclasses: they validate about twice as fast as a BaseModel and carry no __dict__.
+@dataclass(slots=True, frozen=True)
+class BiasAnalysisDetail:
+    quote: str
+    explanation: str
+
+class BiasAnalysisResult(ResultModel):
+    score: float = Field(..., description="A score from 0.0 (neutral) to 1.0 (highly biased).")
+    leaning: Literal["left", "center-left", "center", "center-right", "right"] = Field(..., description="The detected political leaning of the content.")
+    summary: str = Field(..., description="A brief summary of the bias findings.")
+    details: Optional[List[BiasAnalysisDetail]] = Field(None, description="Specific examples from the text that indicate bias.")
+
+class SentimentAnalysisResult(ResultModel):
     overallSentiment: Literal["very-positive", "positive", "neutral", "negative", "very-negative"] = Field(
         ..., description="Overall sentiment"
     )
-    confidence: float = Field(..., ge=0, le=1, description="Confidence score")
+    confidence: Score01 = Field(..., description="Confidence score")
     emotionalTone: List[str] = Field(..., description="Emotional tone indicators")
 
-class ExtractedClaim(BaseModel):
+class ExtractedClaim(ResultModel):
     id: str = Field(..., description="Claim ID")
     statement: str = Field(..., description="Claim statement")
     context: str = Field(..., description="Context")
     importance: Literal["high", "medium", "low"] = Field(..., description="Claim importance")
     category: Literal["factual", "opinion", "prediction", "statistic"] = Field(..., description="Claim category")
 
-class FactCheckSource(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FactCheckSource:
     name: str = Field(..., description="Source name")
     url: str = Field(..., description="Source URL")
-    credibilityScore: Optional[float] = Field(None, ge=0, le=100, description="Source credibility score")
+    credibilityScore: Optional[Score0to100] = Field(None, description="Source credibility score")
 
-class FactCheckResult(BaseModel):
+class FactCheckResult(ResultModel):
     claimId: str = Field(..., description="Associated claim ID")
     status: Literal["verified", "disputed", "unverified", "misleading", "false"] = Field(
         ..., description="Fact check status"
     )
-    confidence: float = Field(..., ge=0, le=1, description="Confidence score")
+    confidence: Score01 = Field(..., description="Confidence score")
     sources: List[FactCheckSource] = Field(default_factory=list, description="Verification sources")
     explanation: str = Field(..., description="Fact check explanation")
 
-class CredibilityFactors(BaseModel):
-    transparency: float = Field(..., ge=0, le=100)
-    accuracy: float = Field(..., ge=0, le=100)
-    bias: float = Field(..., ge=0, le=100)
-    ownership: float = Field(..., ge=0, le=100)
-    expertise: float = Field(..., ge=0, le=100)
+class CredibilityFactors(ResultModel):
+    transparency: Score0to100
+    accuracy: Score0to100
+    bias: Score0to100
+    ownership: Score0to100
+    expertise: Score0to100
 
-class SourceCredibilityResult(BaseModel):
+class SourceCredibilityResult(ResultModel):
     url: str = Field(..., description="Assessed URL")
     domain: str = Field(..., description="Domain")
-    credibilityScore: float = Field(..., ge=0, le=100, description="Credibility score")
+    credibilityScore: Score0to100 = Field(..., description="Credibility score")
     assessment: Literal["highly-credible", "credible", "mixed", "questionable", "unreliable"] = Field(
         ..., description="Credibility assessment"
     )
@@ -133,12 +171,12 @@ class SourceCredibilityResult(BaseModel):
 
 class ComprehensiveAnalysisResults(BaseModel):
     executiveSummary: str = Field(..., description="A concise summary of the analysis findings")
-    biasAnalysis: Optional["BiasAnalysisResult"] = None
+    biasAnalysis: Optional[BiasAnalysisResult] = None
     sentimentAnalysis: Optional[SentimentAnalysisResult] = None
     claimsExtracted: List[ExtractedClaim] = Field(default_factory=list, description="Extracted claims")
     factCheckResults: List[FactCheckResult] = Field(default_factory=list, description="Fact check results")
     sourceCredibility: Optional[SourceCredibilityResult] = Field(None, description="Source credibility")
-    analysisScore: float = Field(..., ge=0, le=100, description="Overall analysis score")
+    analysisScore: Score0to100 = Field(..., description="Overall analysis score")
 
 class AnalysisMetadata(BaseModel):
     processingTime: float = Field(..., description="Processing time in seconds")
@@ -151,13 +189,14 @@ class AnalysisMetadata(BaseModel):
 class AnalysisResultsData(BaseModel):
     analysisId: str = Field(..., description="Analysis ID")
     articleId: Optional[str] = Field(None, description="The unique identifier for the article that was analyzed. Null for raw text analyses.")
-    analysisType: Literal["url", "text"] = Field(..., description="Whether this analysis was performed on a URL or raw text content")
-    status: Literal["pending", "completed", "failed"] = Field(..., description="Analysis status")
-    results: Optional["ComprehensiveAnalysisResults"] = Field(None, description="Comprehensive analysis results (null when status is pending)")
+    analysisType: AnalysisTypeLiteral = Field(..., description="Whether this analysis was performed on a URL or raw text content")
+    status: AnalysisStatusLiteral = Field(..., description="Analysis status")
+    stale: Optional[bool] = Field(None, description="True when OpenAI was unavailable and an earlier cached result for the same content was returned instead")
+    results: Optional[ComprehensiveAnalysisResults] = Field(None, description="Comprehensive analysis results (null when status is pending)")
     metadata: AnalysisMetadata = Field(..., description="Analysis metadata")
 
 class AnalysisResultsResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: AnalysisResultsData
 
 # --- Source Credibility Assessment ---
@@ -177,10 +216,10 @@ class AnalysisHistoryItem(BaseModel):
     analysisId: str
     title: str
     preset: str
-    analysisType: Literal["url", "text"]
+    analysisType: AnalysisTypeLiteral
     createdAt: datetime.datetime
     summary: str = Field(..., description="Brief summary of analysis results")
-    analysisScore: float = Field(..., ge=0, le=100)
+    analysisScore: Score0to100
     article: Optional[ArticleSummary] = Field(None, description="Article details if analysis was performed on a URL")
 
 class PaginatedAnalysisHistoryResponse(BaseModel):
@@ -199,6 +238,8 @@ class ExportRequest(BaseModel):
     )
 
 class ExportResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     downloadUrl: str = Field(..., description="Download URL")
     filename: str = Field(..., description="Generated filename")
     fileSize: int = Field(..., description="File size in bytes")
@@ -211,6 +252,8 @@ class ShareRequest(BaseModel):
     password: Optional[str] = Field(None, description="Share password")
 
 class ShareResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     shareUrl: str = Field(..., description="Shareable URL")
     shareId: str = Field(..., description="Share ID")
     expiresAt: datetime.datetime = Field(..., description="Share link expiration")
@@ -226,14 +269,15 @@ class AnalyzeArticleRequest(BaseModel):
 
 class AnalysisStatusData(BaseModel):
     analysisId: str
-    status: Literal["processing", "completed", "failed"]
+    status: ProcessingStatusLiteral
     estimatedTime: int
 
 class AnalysisStatusResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: AnalysisStatusData
 
-class BiasedPhrase(BaseModel):
+@dataclass(slots=True, frozen=True)
+class BiasedPhrase:
     phrase: str
     explanation: str
     suggestion: str
@@ -244,7 +288,8 @@ class BiasAnalysis(BaseModel):
     biasedPhrases: List[BiasedPhrase]
     overallAssessment: str
 
-class VerifiedClaim(BaseModel):
+@dataclass(slots=True, frozen=True)
+class VerifiedClaim:
     claim: str
     verdict: Literal["true", "false", "partially_true", "unverified"]
     explanation: str
@@ -254,7 +299,8 @@ class FactCheck(BaseModel):
     verifiedClaims: List[VerifiedClaim]
     reliabilityScore: float
 
-class RelatedEvent(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RelatedEvent:
     event: str
     date: str
     relevance: str
@@ -284,48 +330,41 @@ class ImpactAssessment(BaseModel):
 
 # --- Analysis Result Schemas (Refined based on FE feedback) ---
 
-class BiasAnalysisDetail(BaseModel):
-    quote: str
-    explanation: str
-
-class BiasAnalysisResult(BaseModel):
-    score: float = Field(..., description="A score from 0.0 (neutral) to 1.0 (highly biased).")
-    leaning: Literal["left", "center-left", "center", "center-right", "right"] = Field(..., description="The detected political leaning of the content.")
-    summary: str = Field(..., description="A brief summary of the bias findings.")
-    details: Optional[List[BiasAnalysisDetail]] = Field(None, description="Specific examples from the text that indicate bias.")
-
-class FactCheckClaim(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FactCheckClaim:
     claim: str = Field(..., description="The claim extracted from the article.")
     verdict: Literal["verified", "unverified", "false", "misleading"] = Field(..., description="The verdict on the claim's accuracy.")
     source: Optional[str] = Field(None, description="A URL to a source validating the verdict.")
     explanation: Optional[str] = Field(None, description="A brief explanation of the fact-check.")
 
-class FactCheckResultLegacy(BaseModel):
+class FactCheckResultLegacy(ResultModel):
     claims: List[FactCheckClaim]
 
-class ContextRelatedEvent(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ContextRelatedEvent:
     title: str
     url: str
     summary: Optional[str] = None
 
-class ContextAnalysisResult(BaseModel):
+class ContextAnalysisResult(ResultModel):
     historicalBackground: str = Field(..., description="Historical context relevant to the article's topic.")
     relatedEvents: Optional[List[ContextRelatedEvent]] = Field(None, description="Links to articles about related events.")
 
-class SummaryResult(BaseModel):
+class SummaryResult(ResultModel):
     text: str = Field(..., description="A concise summary of the article.")
     keyPoints: List[str] = Field(..., description="A list of bullet points highlighting the key takeaways.")
 
-class ExpertOpinionDetail(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ExpertOpinionDetail:
     expertName: str
     field: str = Field(..., description="The expert's field of expertise.")
     opinion: str = Field(..., description="The expert's opinion on the topic.")
     source: Optional[str] = Field(None, description="A URL to the source of the opinion.")
 
-class ExpertOpinionResult(BaseModel):
+class ExpertOpinionResult(ResultModel):
     opinions: List[ExpertOpinionDetail]
 
-class ImpactAssessmentResult(BaseModel):
+class ImpactAssessmentResult(ResultModel):
     potentialImpact: str = Field(..., description="Analysis of the potential societal, economic, or political impact.")
     affectedGroups: List[str] = Field(..., description="A list of groups or sectors that may be affected.")
 
@@ -338,14 +377,21 @@ class AnalysisResultTypes(BaseModel):
     expertOpinion: Optional[ExpertOpinionResult] = None
     impactAssessment: Optional[ImpactAssessmentResult] = None
 
+class LegacyAnalysisMetadata(BaseModel):
+    processingTime: float
+    analyzedAt: Optional[str] = None
+    modelVersion: Optional[str] = None
+    preset: Optional[str] = None
+    wordsAnalyzed: Optional[int] = None
+
 class AnalysisResultsDataLegacy(BaseModel):
     analysisId: str
     status: Literal["completed"]
     results: AnalysisResultTypes
-    metadata: dict
+    metadata: LegacyAnalysisMetadata
 
 class AnalysisResultsResponseLegacy(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: AnalysisResultsDataLegacy
 
 # --- User Data Schemas (from FE feedback) ---
@@ -363,7 +409,7 @@ class AnalysisRecord(BaseModel):
     analysis_id: str # Should be UUID
     article_title: str
     article_url: Optional[str] = None
-    status: Literal["processing", "completed", "failed"]
+    status: ProcessingStatusLiteral
     created_at: datetime.datetime
 
 class UserProfile(BaseModel):
@@ -379,7 +425,8 @@ class UpdateUserProfileRequest(BaseModel):
     avatarUrl: Optional[str] = None
 
 # Follow-up Questions
-class Question(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Question:
     question: str
     context: str
     type: Literal["critical", "exploratory", "clarifying"]
@@ -388,7 +435,7 @@ class FollowUpQuestionsData(BaseModel):
     questions: List[Question]
 
 class FollowUpQuestionsResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: FollowUpQuestionsData
 
 class ChatContext(BaseModel):
@@ -404,7 +451,7 @@ class ChatSessionData(BaseModel):
     expiresAt: str
 
 class ChatSessionResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: ChatSessionData
 
 class ChatAttachment(BaseModel):
@@ -415,17 +462,23 @@ class ChatMessageRequest(BaseModel):
     message: str
     attachments: Optional[List[ChatAttachment]] = None
 
-class ChatResponseSource(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ChatResponseSource:
     title: str
     url: str
     relevance: float
 
+class ChatResponseBody(BaseModel):
+    content: str
+    sources: Optional[List[ChatResponseSource]] = None
+    suggestedFollowUp: Optional[List[str]] = None
+
 class ChatMessageResponseData(BaseModel):
     messageId: str
-    response: dict
+    response: ChatResponseBody
 
 class ChatMessageResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: ChatMessageResponseData
 
 # --- Content Extraction Schemas ---
@@ -446,13 +499,9 @@ class ExtractedContent(BaseModel):
     processingTime: float = Field(..., description="Processing time in seconds")
 
 class ContentExtractionResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: ExtractedContent
-    timestamp: str = Field(default_factory=lambda: datetime.datetime.now().isoformat())
-
-# Forward reference resolution
-AnalysisPreset.model_rebuild()
-CreatePresetRequest.model_rebuild()
+    timestamp: str = Field(default_factory=iso_now)
 
 # --- RSS News Feed Schemas ---
 
@@ -485,6 +534,8 @@ class CollectedArticle(BaseModel):
     analysis_id: Optional[str] = Field(None, description="Analysis ID if analyzed")
 
 class NewsFeedPagination(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     current_page: int = Field(..., description="Current page number")
     total_pages: int = Field(..., description="Total number of pages")
     total_articles: int = Field(..., description="Total number of articles")
@@ -496,22 +547,16 @@ class NewsFeedData(BaseModel):
     pagination: NewsFeedPagination = Field(..., description="Pagination information")
 
 class NewsFeedResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: NewsFeedData
 
-class AnalyzeArticleRequest(BaseModel):
-    preset: Literal["general", "political", "financial", "scientific", "opinion"] = Field(
-        default="general", description="Analysis preset to use"
-    )
-    options: AnalysisOptions = Field(default_factory=AnalysisOptions, description="Analysis options")
-
 class ArticleAnalysisData(BaseModel):
     analysis_id: str = Field(..., description="Analysis ID")
-    status: Literal["pending", "completed", "failed"] = Field(..., description="Analysis status")
+    status: AnalysisStatusLiteral = Field(..., description="Analysis status")
     estimated_completion_time: Optional[str] = Field(None, description="Estimated completion time")
 
 class ArticleAnalysisResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: ArticleAnalysisData
 
 class RSSCollectionStats(BaseModel):
@@ -523,7 +568,7 @@ class RSSCollectionStats(BaseModel):
     errors: List[str] = Field(default_factory=list, description="Collection errors")
 
 class RSSCollectionResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: RSSCollectionStats
 
 class SchedulerJob(BaseModel):
@@ -533,31 +578,42 @@ class SchedulerJob(BaseModel):
     trigger: str = Field(..., description="Job trigger description")
 
 class SchedulerStatus(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     status: Literal["running", "stopped", "not_started"] = Field(..., description="Scheduler status")
     jobs: List[SchedulerJob] = Field(..., description="List of scheduled jobs")
 
 class SchedulerStatusResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: SchedulerStatus
 
 class AvailableSourcesData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     sources: List[str] = Field(..., description="Available news sources")
 
 class AvailableSourcesResponse(ResponseModel):
-    status: Literal["success"] = "success"
+    status: SuccessLiteral = "success"
     data: AvailableSourcesData
 
 # Missing schemas for RSS endpoints
-class RSSArticleAnalysisRequest(BaseModel):
-    preset: Literal["general", "political", "financial", "scientific", "opinion"] = Field(
-        default="general", description="Analysis preset to use"
-    )
-    options: AnalysisOptions = Field(default_factory=AnalysisOptions, description="Analysis options")
+class RSSArticleAnalysisRequest(_AnalysisRequestBase):
+    pass
 
 class RSSSourcesData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     sources: List[str] = Field(..., description="Available RSS sources")
     total: int = Field(..., description="Total number of sources")
 
 class RSSSourcesResponse(ResponseModel):
-    status: Literal["success"] = "success"
-    data: RSSSourcesData 
\ No newline at end of file
+    status: SuccessLiteral = "success"
+    data: RSSSourcesData
+
+# Prebuilt list adapters for validating database rows in bulk
+COLLECTED_ARTICLE_LIST_ADAPTER = TypeAdapter(List[CollectedArticle])
+ANALYSIS_HISTORY_LIST_ADAPTER = TypeAdapter(List[AnalysisHistoryItem])
+
+# Prebuilt envelope adapters for routes that return pre-serialized bytes
+ANALYSIS_RESULTS_RESPONSE_ADAPTER = TypeAdapter(AnalysisResultsResponse)
+NEWS_FEED_RESPONSE_ADAPTER = TypeAdapter(NewsFeedResponse)
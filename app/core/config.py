@@ -1,4 +1,7 @@
-from pydantic_settings import BaseSettings
+import functools
+from typing import List
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from supabase import create_client, Client
 
 class Settings(BaseSettings):
@@ -7,11 +10,24 @@ class Settings(BaseSettings):
     SUPABASE_JWT_SECRET: str
     SUPABASE_ANON_KEY: str
     API_V1_STR: str = "/v1"
+    # Maximum number of background analyses running OpenAI calls at the same time
+    ANALYSIS_CONCURRENCY: int = 8
+    # Maximum number of OpenAI requests in flight at the same time, across all analyses
+    OPENAI_CONCURRENCY: int = 16
+    # Seconds an analysis result is reused as fresh instead of calling OpenAI again. Both the
+    # per-section result cache and the analysis cache use it; after it, an analysis is only
+    # served from cache, marked stale, when the new OpenAI calls fail.
+    ANALYSIS_CACHE_TTL: int = 3600
+    # Origins allowed to call the API from a browser, as a JSON list, e.g. ["https://app.example.com"]
+    CORS_ORIGINS: List[str] = ["*"]
+    # Largest accepted request body; bigger uploads are rejected with 413
+    MAX_REQUEST_BODY_BYTES: int = 2 * 1024 * 1024
 
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
 
 settings = Settings()
 
-# Create a single, reusable Supabase client instance
-supabase_client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY) 
\ No newline at end of file
+# A single, reusable Supabase client, created on first use rather than at import
+@functools.lru_cache(maxsize=1)
+def get_supabase_client() -> Client:
+    return create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
@@ -0,0 +1,27 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+def _default(obj: Any) -> Any:
+    """orjson fallback for Pydantic models nested inside plain dicts and lists."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, or with pydantic-core for a model.
+
+    For routes without a response_model. Leave routes that declare one on FastAPI's
+    default response class: only then does FastAPI serialize them straight to bytes
+    through the model's TypeAdapter. datetime values are encoded natively, no
+    .isoformat() needed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return to_json(content, by_alias=True)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
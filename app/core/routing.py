@@ -0,0 +1,74 @@
+import logging
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from app.core.config import settings
+from app.core.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+def _body_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Request body exceeds {settings.MAX_REQUEST_BODY_BYTES} bytes",
+    )
+
+class ORJSONRequest(Request):
+    """
+    Request whose JSON body is parsed with orjson instead of the stdlib json module.
+
+    The body is also capped at MAX_REQUEST_BODY_BYTES while it is read, so an oversized
+    upload is rejected before it is buffered in full.
+    """
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            limit = settings.MAX_REQUEST_BODY_BYTES
+            content_length = self.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > limit:
+                raise _body_too_large()
+
+            chunks = []
+            size = 0
+            async for chunk in self.stream():
+                size += len(chunk)
+                if size > limit:
+                    raise _body_too_large()
+                chunks.append(chunk)
+            self._body = b"".join(chunks)
+        return self._body
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI still
+            # turns malformed bodies into a 422 json_invalid error
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+class ORJSONRoute(APIRoute):
+    """
+    APIRoute that hands its endpoint an ORJSONRequest, so request bodies are decoded by orjson.
+
+    Errors that escape the endpoint become a generic 500 here, instead of per-route
+    try/except blocks. Handling them inside the route keeps the response within
+    CORSMiddleware, so browsers can still read it; an app-level Exception handler runs
+    outside that middleware and its responses carry no CORS headers.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as exc:
+                logger.error("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+                return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+
+        return route_handler
@@ -1,33 +1,76 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.config import supabase_client
+from app.core.config import settings
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """The caller identified by a verified Supabase access token."""
+    id: str
+    email: Optional[str] = None
+    role: Optional[str] = None
+
+# Verified users by token digest, so a burst of requests with the same token verifies
+# the signature once. Entries never outlive the token's own exp.
+_USER_CACHE_TTL = 30.0
+_USER_CACHE_MAX_ENTRIES = 10_000
+_user_cache: Dict[bytes, Tuple[float, AuthenticatedUser]] = {}
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()[:16]
+
+def _authenticate(token: str) -> AuthenticatedUser:
+    """Resolve a token to its Supabase user; the user is guaranteed to have an `id`."""
+    key = _token_key(token)
+    now = time.monotonic()
+    entry = _user_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
     try:
-        # Use the Supabase client to validate the token
-        user_response = supabase_client.auth.get_user(token)
-        return user_response.user
-    except Exception as e:
-        # The Supabase client will raise an exception for invalid tokens
+        # Supabase signs access tokens with the project's JWT secret, so they are verified
+        # locally instead of with an auth.get_user round-trip to Supabase Auth
+        claims = jwt.decode(
+            token,
+            settings.SUPABASE_JWT_SECRET,
+            algorithms=["HS256"],
+            audience="authenticated",
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid authentication credentials: {e}",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_current_user_with_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    try:
-        # Use the Supabase client to validate the token
-        user_response = supabase_client.auth.get_user(token)
-        return {"user": user_response.user, "token": token}
-    except Exception as e:
-        # The Supabase client will raise an exception for invalid tokens
+    if not claims["sub"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid authentication credentials: {e}",
+            detail="Invalid authentication credentials: token has no user",
             headers={"WWW-Authenticate": "Bearer"},
-        ) 
\ No newline at end of file
+        )
+
+    user = AuthenticatedUser(id=claims["sub"], email=claims.get("email"), role=claims.get("role"))
+    deadline = min(now + _USER_CACHE_TTL, now + (float(claims["exp"]) - time.time()))
+    _user_cache.pop(key, None)
+    if len(_user_cache) >= _USER_CACHE_MAX_ENTRIES:
+        del _user_cache[next(iter(_user_cache))]
+    _user_cache[key] = (deadline, user)
+    return user
+
+# Verification is local and cached, so the dependencies are async and run inline on the
+# event loop; sync dependencies would cost a threadpool round-trip per request.
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return _authenticate(credentials.credentials)
+
+async def get_current_user_with_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    return {"user": _authenticate(token), "token": token}
@@ -1,12 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.api.v1 import endpoints as api_v1
 from app.core.config import settings
+from app.core.responses import ORJSONResponse
 from app.services.scheduler_service import scheduler_service
+from app.services.background_service import background_service
+from app.services.content_extraction_service import content_extraction_service
+from contextlib import asynccontextmanager
+import asyncio
+import atexit
+import functools
 import logging
+import orjson
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging. Request paths only enqueue records; a listener thread does the
+# blocking writes to stderr.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
+# Flush queued records when the process exits
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Define common error responses for the OpenAPI schema
@@ -17,44 +35,86 @@ responses = {
     422: {"description": "Input validation failed."},
 }
 
+async def _stop_background_services():
+    logger.info("Stopping CritiqueWire Backend services...")
+    await scheduler_service.stop()
+    logger.info("Background scheduler stopped successfully")
+
+async def _drain_background_analyses():
+    await background_service.drain()
+    logger.info("Background analyses drained")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services on startup and stop them on shutdown."""
+    # Build and encode the OpenAPI document now rather than on the first /openapi.json or
+    # /docs hit, so every model's JSON schema is generated exactly once per process.
+    _openapi_bytes()
+
+    try:
+        logger.info("Starting CritiqueWire Backend services...")
+        await scheduler_service.start()
+        logger.info("Background scheduler started successfully")
+    except Exception as e:
+        logger.error(f"Failed to start background services: {e}")
+        # Don't prevent the app from starting if scheduler fails
+        # This allows the API to work even if RSS collection is not available
+
+    yield
+
+    # The scheduler and the running analyses are independent, so stop them concurrently
+    results = await asyncio.gather(
+        _stop_background_services(), _drain_background_analyses(), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Error stopping background services: {result}")
+
+    # Closed last: the drained analyses may still have been extracting content
+    await content_extraction_service.aclose()
+
+# The OpenAPI document and docs pages are served by the routes at the bottom of this
+# module, from bytes encoded once, instead of by FastAPI's built-in routes
 app = FastAPI(
     title="CritiqueWire Backend",
-    responses=responses
+    responses=responses,
+    lifespan=lifespan,
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for now
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
     allow_headers=["*"],
 )
 
+# News feed pages carry full article text; level 1 keeps the CPU cost low. Server-sent
+# events are left uncompressed by the middleware.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 app.include_router(api_v1.router, prefix=settings.API_V1_STR)
 
-@app.on_event("startup")
-async def startup_event():
-    """Start background services when the application starts."""
-    try:
-        logger.info("Starting CritiqueWire Backend services...")
-        await scheduler_service.start()
-        logger.info("Background scheduler started successfully")
-    except Exception as e:
-        logger.error(f"Failed to start background services: {e}")
-        # Don't prevent the app from starting if scheduler fails
-        # This allows the API to work even if RSS collection is not available
+@app.get("/", response_class=ORJSONResponse)
+def read_root():
+    return {"message": "Welcome to CritiqueWire Backend"} 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Stop background services when the application shuts down."""
-    try:
-        logger.info("Stopping CritiqueWire Backend services...")
-        await scheduler_service.stop()
-        logger.info("Background scheduler stopped successfully")
-    except Exception as e:
-        logger.error(f"Error stopping background services: {e}")
+@functools.cache
+def _openapi_bytes() -> bytes:
+    return orjson.dumps(app.openapi())
 
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to CritiqueWire Backend"} 
\ No newline at end of file
+@app.get("/openapi.json", include_in_schema=False)
+def openapi_json():
+    return Response(content=_openapi_bytes(), media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+def swagger_ui():
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{app.title} - Swagger UI")
+
+@app.get("/redoc", include_in_schema=False)
+def redoc():
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
@@ -0,0 +1,64 @@
+import hashlib
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+class AnalysisCacheService:
+    """In-process cache of completed analysis results, keyed by content, preset and options."""
+
+    def __init__(self, fresh_ttl: int = 3600, stale_ttl: int = 86400, max_entries: int = 1024):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, bytes]] = {}
+
+    def make_key(self, content: str, preset: str, options_json: str) -> str:
+        """
+        Build the cache key for an analysis request.
+
+        Args:
+            content: The content being analyzed
+            preset: The analysis preset
+            options_json: The serialized analysis options
+
+        Returns:
+            A key of the form "<content hash>:<preset>:<options hash>"
+        """
+        content_hash = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+        options_hash = hashlib.blake2b(options_json.encode("utf-8"), digest_size=8).hexdigest()
+        return f"{content_hash}:{preset}:{options_hash}"
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[bytes]:
+        """
+        Get cached results for a key.
+
+        Args:
+            key: The cache key
+            allow_stale: Also return entries past the fresh TTL (but within the stale TTL)
+
+        Returns:
+            The cached JSON-encoded results or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, results = entry
+        age = time.monotonic() - stored_at
+        if age >= self.stale_ttl:
+            del self._entries[key]
+            return None
+        if age >= self.fresh_ttl and not allow_stale:
+            return None
+        return results
+
+    def set(self, key: str, results: bytes):
+        """Store JSON-encoded results, evicting the oldest entry when the cache is full."""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic(), results)
+
+# Create a singleton instance
+analysis_cache_service = AnalysisCacheService(fresh_ttl=settings.ANALYSIS_CACHE_TTL)
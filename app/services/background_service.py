@@ -1,15 +1,91 @@
 import asyncio
+import functools
+import logging
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Set
+from app.core.config import settings
 from app.services.openai_service import openai_service
 from app.services.database_service import database_service
 from app.api.v1 import schemas
 
+logger = logging.getLogger(__name__)
+
 class BackgroundService:
     """Simple background service for processing async analyses."""
     
     def __init__(self):
         self.running_tasks = {}
+        # Strong references to fire-and-forget tasks, so they are not garbage collected mid-run
+        self.background_tasks: Set[asyncio.Task] = set()
+        # Caps how many analyses hit OpenAI concurrently; extra ones wait their turn
+        self.analysis_semaphore = asyncio.Semaphore(settings.ANALYSIS_CONCURRENCY)
+        # Queues of clients streaming an analysis, woken when its background processing ends
+        self.analysis_listeners: Dict[str, Set[asyncio.Queue]] = {}
+    
+    def spawn(self, coro) -> asyncio.Task:
+        """
+        Run a coroutine in the background, keeping it tracked until it finishes.
+        
+        Args:
+            coro: The coroutine to run
+            
+        Returns:
+            The created task
+        """
+        # Deliberately not started eagerly (eager_task_factory / eager_start): analyses begin
+        # with blocking Supabase calls, which would then run before the response is sent
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+        return task
+    
+    def _on_background_task_done(self, task: asyncio.Task):
+        self.background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background task failed", exc_info=task.exception())
+    
+    async def drain(self, timeout: float = 30.0):
+        """
+        Wait for in-flight background tasks, cancelling any still running after the timeout.
+        
+        Args:
+            timeout: Seconds to wait before cancelling the remaining tasks
+        """
+        if not self.background_tasks:
+            return
+        
+        _, pending = await asyncio.wait(set(self.background_tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    def subscribe(self, analysis_id: str) -> asyncio.Queue:
+        """
+        Register interest in an analysis finishing.
+        
+        Args:
+            analysis_id: The analysis to listen for
+            
+        Returns:
+            A queue that receives the analysis ID when its background processing ends
+        """
+        queue = asyncio.Queue()
+        self.analysis_listeners.setdefault(analysis_id, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, analysis_id: str, queue: asyncio.Queue):
+        """Remove a queue registered with subscribe."""
+        listeners = self.analysis_listeners.get(analysis_id)
+        if listeners is None:
+            return
+        listeners.discard(queue)
+        if not listeners:
+            del self.analysis_listeners[analysis_id]
+    
+    def notify(self, analysis_id: str):
+        """Wake every client listening for this analysis."""
+        for queue in self.analysis_listeners.get(analysis_id, ()):
+            queue.put_nowait(analysis_id)
     
     async def process_analysis_async(self, analysis_id: str, user_id: str, content: str, request_data: Dict[str, Any]):
         """
@@ -47,12 +123,15 @@ class BackgroundService:
             if options.get("includeExecutiveSummary"):
                 tasks["executiveSummary"] = openai_service.get_executive_summary(content, preset)
             
-            # Execute tasks concurrently
-            if tasks:
-                results_values = await asyncio.gather(*tasks.values())
-                results_dict = dict(zip(tasks.keys(), results_values))
-            else:
-                results_dict = {}
+            # Execute tasks concurrently; a section that raises is left out instead of
+            # discarding the sections that succeeded
+            results_values = await asyncio.gather(*tasks.values(), return_exceptions=True)
+            results_dict = {}
+            for key, value in zip(tasks.keys(), results_values):
+                if isinstance(value, BaseException):
+                    logger.warning("%s failed for analysis %s", key, analysis_id, exc_info=value)
+                else:
+                    results_dict[key] = value
             
             # Check if we got any valid results from OpenAI
             valid_results = [v for v in results_dict.values() if v is not None]
@@ -69,9 +148,12 @@ class BackgroundService:
                         openai_service.fact_check_claim(claim.statement, claim.id) 
                         for claim in claims[:5]  # Limit to first 5 claims for performance
                     ]
-                    fact_check_results = await asyncio.gather(*fact_check_tasks)
+                    fact_check_results = await asyncio.gather(*fact_check_tasks, return_exceptions=True)
                     # Filter out failed fact-check results
-                    fact_check_results = [result for result in fact_check_results if result is not None]
+                    fact_check_results = [
+                        result for result in fact_check_results
+                        if result is not None and not isinstance(result, BaseException)
+                    ]
             
             # Calculate overall analysis score
             analysis_score = openai_service.calculate_analysis_score(results_dict)
@@ -79,7 +161,7 @@ class BackgroundService:
             processing_time = time.time() - start_time
             
             # Build comprehensive results
-            comprehensive_results = schemas.ComprehensiveAnalysisResults(
+            comprehensive_results = schemas.ComprehensiveAnalysisResults.model_construct(
                 executiveSummary=results_dict.get("executiveSummary"),  # No fallback
                 biasAnalysis=results_dict.get("biasAnalysis"),
                 sentimentAnalysis=results_dict.get("sentimentAnalysis"),
@@ -94,21 +176,15 @@ class BackgroundService:
                 analysis_id, 
                 user_id, 
                 "completed", 
-                comprehensive_results.model_dump()
+                # JSON-compatible values in one pass: the Supabase client encodes the update
+                # body with the stdlib json module, which rejects datetimes
+                comprehensive_results.model_dump(mode="json")
             )
-            
-            # Remove from running tasks
-            if analysis_id in self.running_tasks:
-                del self.running_tasks[analysis_id]
                 
         except Exception as e:
             # Update status to failed
             await database_service.update_analysis_status(analysis_id, user_id, "failed")
             
-            # Remove from running tasks
-            if analysis_id in self.running_tasks:
-                del self.running_tasks[analysis_id]
-            
             print(f"Background analysis failed for {analysis_id}: {e}")
     
     def start_analysis_task(self, analysis_id: str, user_id: str, content: str, request_data: Dict[str, Any]):
@@ -121,16 +197,21 @@ class BackgroundService:
             content: The content to analyze
             request_data: The original request data
         """
-        # Create and start the background task
-        task = asyncio.create_task(
+        # Create and start the background task; spawn keeps it referenced and drained on shutdown
+        task = self.spawn(
             self.process_analysis_async(analysis_id, user_id, content, request_data)
         )
         
-        # Store the task reference
+        # Store the task reference until it finishes, however it finishes (including cancellation)
         self.running_tasks[analysis_id] = task
+        task.add_done_callback(functools.partial(self._on_analysis_task_done, analysis_id))
         
         return task
     
+    def _on_analysis_task_done(self, analysis_id: str, task: asyncio.Task):
+        if self.running_tasks.get(analysis_id) is task:
+            del self.running_tasks[analysis_id]
+    
     def get_task_status(self, analysis_id: str):
         """
         Get the status of a running task.
@@ -2,15 +2,39 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json
 import uuid
-from app.core.config import supabase_client, settings
+from app.core.config import get_supabase_client
 from app.api.v1 import schemas
-from supabase import create_client
+from app.utils.clock import iso_now
+from app.utils.text import count_words
+from postgrest import SyncPostgrestClient
+from postgrest.exceptions import APIError
 
 class DatabaseService:
     """Service for handling database operations with Supabase."""
     
-    def __init__(self):
-        self.supabase = supabase_client
+    @property
+    def supabase(self):
+        return get_supabase_client()
+    
+    def _client(self, jwt_token: Optional[str] = None):
+        """
+        Get a client for table and RPC calls, acting as the token's user if one is given.
+        
+        A user's client only swaps the Authorization header and shares the anon client's
+        connection pool, so no Supabase client or auth session is set up per request.
+        """
+        if not jwt_token:
+            return self.supabase
+        
+        shared = self.supabase.postgrest
+        headers = shared.headers.copy()
+        headers["Authorization"] = f"Bearer {jwt_token}"
+        return SyncPostgrestClient(
+            str(shared.base_url),
+            schema=headers["Accept-Profile"],
+            headers=headers,
+            http_client=shared.session,
+        )
     
     async def store_analysis(self, analysis_data: Dict[str, Any], user_id: str, jwt_token: str = None) -> str:
         """
@@ -47,27 +71,14 @@ class DatabaseService:
                     "processingTime": analysis_data.get("processingTime", 0.0),  # Use camelCase to match schema
                     "preset": analysis_data.get("preset", "general"),
                     "createdAt": datetime.utcnow().isoformat(),
-                    "wordsAnalyzed": len(analysis_data.get("content", "").split()) if analysis_data.get("content") else 0,
+                    "wordsAnalyzed": count_words(analysis_data.get("content")),
                     **analysis_data.get("metadata", {})
                 }
             }
             
             print("[DEBUG] analysis_record to insert:", json.dumps(analysis_record, indent=2, default=str))
             
-            # Use JWT token for authentication if provided
-            if jwt_token:
-                # Create a new client instance 
-                client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-                # Set the session with the JWT token - we'll use the access token as both access and refresh for this operation
-                try:
-                    client.auth.set_session(jwt_token, jwt_token)
-                except Exception as e:
-                    print(f"[DEBUG] Failed to set session: {e}")
-                    # Fallback: try to set headers directly on the client
-                    if hasattr(client, 'postgrest'):
-                        client.postgrest.session.headers.update({"Authorization": f"Bearer {jwt_token}"})
-            else:
-                client = self.supabase
+            client = self._client(jwt_token)
             
             # Insert into the analyses table
             result = client.table("analyses").insert(analysis_record).execute()
@@ -95,19 +106,11 @@ class DatabaseService:
             The analysis data or None if not found
         """
         try:
-            # Use JWT token for authentication if provided
-            if jwt_token:
-                client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-                try:
-                    client.auth.set_session(jwt_token, jwt_token)
-                except Exception as e:
-                    print(f"[DEBUG] Failed to set session: {e}")
-                    if hasattr(client, 'postgrest'):
-                        client.postgrest.session.headers.update({"Authorization": f"Bearer {jwt_token}"})
-            else:
-                client = self.supabase
+            client = self._client(jwt_token)
             
-            result = client.table("analyses").select("*").eq("id", analysis_id).eq("user_id", user_id).execute()
+            result = client.table("analyses").select(
+                "id, title, article_id, analysis_type, status, results, metadata, created_at"
+            ).eq("id", analysis_id).eq("user_id", user_id).execute()
             
             if result.data:
                 analysis_record = result.data[0]
@@ -133,17 +136,7 @@ class DatabaseService:
             Dictionary with content, metadata, and options or None if not found
         """
         try:
-            # Use JWT token for authentication if provided
-            if jwt_token:
-                client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-                try:
-                    client.auth.set_session(jwt_token, jwt_token)
-                except Exception as e:
-                    print(f"[DEBUG] Failed to set session: {e}")
-                    if hasattr(client, 'postgrest'):
-                        client.postgrest.session.headers.update({"Authorization": f"Bearer {jwt_token}"})
-            else:
-                client = self.supabase
+            client = self._client(jwt_token)
             
             result = client.table("analyses").select("content, metadata, preset, url").eq("id", analysis_id).eq("user_id", user_id).execute()
             
@@ -201,51 +194,52 @@ class DatabaseService:
             Dictionary with analyses and pagination info
         """
         try:
-            # Use JWT token for authentication if provided
-            if jwt_token:
-                client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-                try:
-                    client.auth.set_session(jwt_token, jwt_token)
-                except Exception as e:
-                    print(f"[DEBUG] Failed to set session: {e}")
-                    if hasattr(client, 'postgrest'):
-                        client.postgrest.session.headers.update({"Authorization": f"Bearer {jwt_token}"})
-            else:
-                client = self.supabase
-                
-            # Start with base query
-            query = client.table("analyses").select("*").eq("user_id", user_id)
-            
-            # Apply filters
-            if search:
-                query = query.or_(f"title.ilike.%{search}%,content_preview.ilike.%{search}%")
-            
-            if preset:
-                query = query.eq("preset", preset)
-                
-            if analysis_type:
-                query = query.eq("analysis_type", analysis_type)
+            client = self._client(jwt_token)
                 
-            if date_from:
-                query = query.gte("created_at", date_from)
+            def apply_filters(query):
+                if search:
+                    query = query.or_(f"title.ilike.%{search}%,content_preview.ilike.%{search}%")
                 
-            if date_to:
-                query = query.lte("created_at", date_to)
+                if preset:
+                    query = query.eq("preset", preset)
+                    
+                if analysis_type:
+                    query = query.eq("analysis_type", analysis_type)
+                    
+                if date_from:
+                    query = query.gte("created_at", date_from)
+                    
+                if date_to:
+                    query = query.lte("created_at", date_to)
+                return query
+            
+            # Start with base query
+            # Only the columns used to build history items (skips the full content column).
+            # The total for pagination comes back with the page itself (count="exact").
+            query = apply_filters(client.table("analyses").select(
+                "id, title, preset, analysis_type, created_at, results, metadata, url, article_id",
+                count="exact"
+            ).eq("user_id", user_id))
             
             # Apply ordering and pagination
             query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
             
-            result = query.execute()
+            try:
+                result = query.execute()
+            except APIError as e:
+                if e.code != "PGRST103":
+                    raise
+                # PostgREST rejects an offset past the last row when counting, so the total
+                # for an empty page past the end is counted on its own
+                result = apply_filters(
+                    client.table("analyses").select("id", count="exact", head=True).eq("user_id", user_id)
+                ).execute()
             
-            # Get total count for pagination
-            count_query = client.table("analyses").select("id", count="exact").eq("user_id", user_id)
-            count_result = count_query.execute()
-            total_count = count_result.count if count_result.count is not None else 0
+            total_count = result.count if result.count is not None else 0
             
             # Format the response
-            analyses = []
-            for record in result.data:
-                analysis_item = {
+            analyses = schemas.ANALYSIS_HISTORY_LIST_ADAPTER.validate_python([
+                {
                     "analysisId": record["id"],
                     "title": record["title"],
                     "preset": record["preset"],
@@ -255,7 +249,8 @@ class DatabaseService:
                     "analysisScore": self._extract_analysis_score(record),
                     "article": self._format_article_summary(record) if record.get("url") else None
                 }
-                analyses.append(analysis_item)
+                for record in result.data
+            ])
             
             return {
                 "items": analyses,
@@ -289,38 +284,17 @@ class DatabaseService:
             if results:
                 update_data["results"] = results  # Store as dict, Supabase will convert to JSONB
             
-            # Use JWT token for authentication if provided
-            if jwt_token:
-                client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-                try:
-                    client.auth.set_session(jwt_token, jwt_token)
-                except Exception as e:
-                    print(f"[DEBUG] Failed to set session: {e}")
-                    if hasattr(client, 'postgrest'):
-                        client.postgrest.session.headers.update({"Authorization": f"Bearer {jwt_token}"})
-            else:
-                client = self.supabase
+            client = self._client(jwt_token)
             
             print(f"[DEBUG] Updating analysis {analysis_id} status to {status} for user {user_id}")
             
-            # First, let's check if the record exists
-            check_result = client.table("analyses").select("id, user_id, status").eq("id", analysis_id).execute()
-            print(f"[DEBUG] Analysis record check: {check_result}")
-            
-            if not check_result.data:
+            # A single UPDATE by id: PostgREST returns the updated rows, so an empty result
+            # means the analysis does not exist (or RLS hides it). user_id is not filtered on,
+            # since background tasks may update on behalf of a different stored user_id.
+            result = client.table("analyses").update(update_data).eq("id", analysis_id).execute()
+            if not result.data:
                 print(f"[ERROR] No analysis found with id {analysis_id}")
                 return False
-                
-            stored_user_id = check_result.data[0].get("user_id")
-            print(f"[DEBUG] Stored user_id: {stored_user_id}, Provided user_id: {user_id}")
-            print(f"[DEBUG] User IDs match: {stored_user_id == user_id}")
-            
-            # If user IDs don't match, try updating without user_id filter (for background tasks)
-            if stored_user_id != user_id:
-                print(f"[WARNING] User ID mismatch, updating analysis {analysis_id} without user_id filter")
-                result = client.table("analyses").update(update_data).eq("id", analysis_id).execute()
-            else:
-                result = client.table("analyses").update(update_data).eq("id", analysis_id).eq("user_id", user_id).execute()
             print(f"[DEBUG] Update result: {result}")
             
             return len(result.data) > 0
@@ -363,41 +337,13 @@ class DatabaseService:
             True if successful, False otherwise
         """
         try:
-            # Prepare the data for storage
-            analysis_record = {
-                "id": analysis_id,
-                "user_id": user_id,
-                "title": title or "Analysis",
-                "preset": preset,
-                "analysis_type": content_type,  # This should be 'url' or 'text', NOT comma-separated analysis types
-                "status": "pending",
-                "article_id": article_id,
-                "url": url,
-                "content": content,  # Store full content for analysis processing
-                "content_preview": content[:500] if content else "",
-                "results": None,
-                "metadata": {
-                    "original_analysis_types": analysis_types,  # Store the actual analysis types here
-                    "processingTime": 0.0,  # Use camelCase to match schema
-                    "preset": preset,
-                    "createdAt": datetime.utcnow().isoformat(),
-                    "wordsAnalyzed": len(content.split()) if content else 0,
-                }
-            }
+            analysis_record = self._build_analysis_record(
+                analysis_id, user_id, content, analysis_types, content_type, preset, title, url, article_id
+            )
             
             print("[DEBUG] Creating analysis record:", json.dumps(analysis_record, indent=2, default=str))
             
-            # Use JWT token for authentication if provided
-            if jwt_token:
-                client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-                try:
-                    client.auth.set_session(jwt_token, jwt_token)
-                except Exception as e:
-                    print(f"[DEBUG] Failed to set session: {e}")
-                    if hasattr(client, 'postgrest'):
-                        client.postgrest.session.headers.update({"Authorization": f"Bearer {jwt_token}"})
-            else:
-                client = self.supabase
+            client = self._client(jwt_token)
             
             # Insert into the analyses table
             result = client.table("analyses").insert(analysis_record).execute()
@@ -408,6 +354,114 @@ class DatabaseService:
             print(f"Error creating analysis: {e}")
             return False
     
+    async def get_article_for_analysis(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the article fields needed to start an analysis.
+        
+        Always issues the same primary-key lookup, so PostgREST can reuse its prepared
+        statement for it instead of planning a new query shape per caller.
+        
+        Args:
+            article_id: The article ID
+            
+        Returns:
+            The article's title, url, content, content_extracted_at and analysis_id, or None if not found
+        """
+        result = self.supabase.table("articles").select(
+            "title, url, content, content_extracted_at, analysis_id"
+        ).eq("id", article_id).limit(1).execute()
+        
+        return result.data[0] if result.data else None
+    
+    async def create_analysis_and_mark_article(
+        self,
+        analysis_id: str,
+        user_id: str,
+        content: str,
+        analysis_types: List[str],
+        preset: str,
+        article_id: str,
+        jwt_token: str = None,
+        title: str = "",
+        url: str = None
+    ) -> bool:
+        """
+        Create a pending URL analysis for an article and mark the article as pending, in one request.
+        
+        Runs the create_analysis_and_mark_article database function
+        (docs/migration-create-analysis-and-mark-article.sql), which inserts the analysis
+        and updates the article's analysis_status/analysis_id in a single statement.
+        
+        Args:
+            analysis_id: The analysis ID
+            user_id: The user ID
+            content: The content being analyzed
+            analysis_types: List of analysis types (e.g., ['bias', 'sentiment'])
+            preset: The analysis preset
+            article_id: The article being analyzed
+            jwt_token: Optional JWT token for authentication
+            title: Optional title
+            url: The article URL
+            
+        Returns:
+            True if the analysis was created, False otherwise
+        """
+        try:
+            analysis_record = self._build_analysis_record(
+                analysis_id, user_id, content, analysis_types, "url", preset, title, url, article_id
+            )
+            
+            client = self._client(jwt_token)
+            
+            result = client.rpc(
+                "create_analysis_and_mark_article",
+                {"p_analysis": analysis_record, "p_article_id": article_id}
+            ).execute()
+            
+            if not result.data:
+                # The analysis row exists, only the article status could not be updated
+                print(f"[WARNING] Analysis {analysis_id} created but article {article_id} was not marked as pending")
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error creating analysis for article {article_id}: {e}")
+            return False
+    
+    def _build_analysis_record(
+        self,
+        analysis_id: str,
+        user_id: str,
+        content: str,
+        analysis_types: List[str],
+        content_type: str,
+        preset: str,
+        title: str,
+        url: Optional[str],
+        article_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the analyses row for a new pending analysis."""
+        return {
+            "id": analysis_id,
+            "user_id": user_id,
+            "title": title or "Analysis",
+            "preset": preset,
+            "analysis_type": content_type,  # This should be 'url' or 'text', NOT comma-separated analysis types
+            "status": "pending",
+            "article_id": article_id,
+            "url": url,
+            "content": content,  # Store full content for analysis processing
+            "content_preview": content[:500] if content else "",
+            "results": None,
+            "metadata": {
+                "original_analysis_types": analysis_types,  # Store the actual analysis types here
+                "processingTime": 0.0,  # Use camelCase to match schema
+                "preset": preset,
+                "createdAt": datetime.utcnow().isoformat(),
+                "wordsAnalyzed": count_words(content),
+            }
+        }
+    
     def _format_analysis_response(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Format a database record into the API response format."""
         try:
@@ -428,7 +482,7 @@ class DatabaseService:
                 "processingTime": metadata.get("processing_time") or metadata.get("processingTime", 0.0),
                 "preset": metadata.get("preset", "general"),
                 "wordsAnalyzed": metadata.get("wordsAnalyzed", 0),
-                "createdAt": metadata.get("createdAt") or record.get("created_at") or datetime.utcnow().isoformat()
+                "createdAt": metadata.get("createdAt") or record.get("created_at") or datetime.utcnow()
             }
             
             # Build the response with safe field access
@@ -446,7 +500,7 @@ class DatabaseService:
             response = {
                 "status": "success",
                 "data": data,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": iso_now()
             }
             
             return response
@@ -470,10 +524,10 @@ class DatabaseService:
                         "processingTime": 0.0,
                         "preset": "general",
                         "wordsAnalyzed": 0,
-                        "createdAt": datetime.utcnow().isoformat()
+                        "createdAt": datetime.utcnow()
                     }
                 },
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": iso_now()
             }
     
     def _generate_summary(self, record: Dict[str, Any]) -> str:
@@ -1,12 +1,44 @@
 from openai import AsyncOpenAI
 from app.core.config import settings
 from app.api.v1 import schemas
+import asyncio
+import hashlib
 import json
 import datetime
+import functools
+import time
 import uuid
 from pydantic import ValidationError
 from urllib.parse import urlparse
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Tuple
+
+_CLAIM_IMPORTANCE_WEIGHTS = {"high": 3, "medium": 2, "low": 1}
+
+# Validated analysis results by system prompt and article text, so a retried analysis or the
+# same article analyzed again with the same preset doesn't repeat the OpenAI call. Kept no
+# longer than ANALYSIS_CACHE_TTL, so it never hands an expired analysis back as fresh.
+_RESULT_CACHE_MAX_ENTRIES = 2048
+
+# Preset-specific instructions
+_PRESET_INSTRUCTIONS = {
+    "general": "Provide balanced, objective analysis suitable for general audiences.",
+    "political": "Focus on political implications, bias detection, partisan language, and policy impacts. Pay special attention to loaded language and political framing.",
+    "financial": "Emphasize market implications, economic indicators, financial data accuracy, and business impact. Focus on quantitative claims and market sentiment.",
+    "scientific": "Prioritize scientific accuracy, methodology assessment, peer review status, and evidence quality. Evaluate statistical claims and research validity.",
+    "opinion": "Distinguish between factual claims and opinions. Analyze argumentative structure, logical fallacies, and persuasive techniques."
+}
+
+@functools.cache
+def _prompt_schema(response_model) -> str:
+    """The indented JSON Schema embedded in prompts; the models are static, so build it once per model."""
+    return json.dumps(response_model.model_json_schema(), indent=2)
+
+# Response wrappers for the claim extraction and executive summary prompts
+class ClaimsResponse(schemas.ResultModel):
+    claims: List[schemas.ExtractedClaim]
+
+class SummaryResponse(schemas.ResultModel):
+    summary: str
 
 class OpenAIService:
     def __init__(self):
@@ -17,13 +49,32 @@ class OpenAIService:
         
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = "gpt-4o"
+        # Caps in-flight completions across every analysis, so bursts queue here instead of
+        # exhausting the client's connection pool and drawing 429s
+        self.request_semaphore = asyncio.Semaphore(settings.OPENAI_CONCURRENCY)
+        self._result_cache: Dict[bytes, Tuple[float, Any]] = {}
+
+    async def _create_completion(self, **kwargs):
+        """Create a chat completion, waiting for a free slot if OPENAI_CONCURRENCY are in flight."""
+        async with self.request_semaphore:
+            return await self.client.chat.completions.create(**kwargs)
 
     async def _analyze(self, article_text: str, system_prompt: str, response_model):
         """
         A generic method to call the OpenAI API for analysis and validate the response.
         """
+        # The system prompt already encodes the task, response model and preset
+        cache_key = hashlib.blake2b(
+            system_prompt.encode("utf-8") + b"\0" + article_text.encode("utf-8"), digest_size=16
+        ).digest()
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                return cached[1]
+            del self._result_cache[cache_key]
+        
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.model,
                 response_format={"type": "json_object"},
                 messages=[
@@ -31,9 +82,9 @@ class OpenAIService:
                     {"role": "user", "content": article_text},
                 ],
             )
-            response_json = json.loads(response.choices[0].message.content)
-            return response_model.model_validate(response_json)
-        except (json.JSONDecodeError, ValidationError, IndexError) as e:
+            # Parse and validate in one pass, without building an intermediate dict
+            result = response_model.model_validate_json(response.choices[0].message.content)
+        except (ValidationError, IndexError) as e:
             print(f"[ERROR] OpenAI analysis parsing error: {e}")
             print(f"[ERROR] Response content: {response.choices[0].message.content if 'response' in locals() else 'No response'}")
             return None
@@ -47,23 +98,19 @@ class OpenAIService:
             import traceback
             print(f"[ERROR] Full traceback: {traceback.format_exc()}")
             return None
+        
+        # Only validated results are cached, so failures are retried on the next call
+        self._result_cache.pop(cache_key, None)
+        if len(self._result_cache) >= _RESULT_CACHE_MAX_ENTRIES:
+            del self._result_cache[next(iter(self._result_cache))]
+        self._result_cache[cache_key] = (time.monotonic() + settings.ANALYSIS_CACHE_TTL, result)
+        return result
 
     def _get_system_prompt(self, task_description: str, response_model, preset: str = "general") -> str:
         """
         Creates a standardized system prompt for a given task with preset-specific instructions.
         """
-        schema = response_model.model_json_schema()
-        
-        # Preset-specific instructions
-        preset_instructions = {
-            "general": "Provide balanced, objective analysis suitable for general audiences.",
-            "political": "Focus on political implications, bias detection, partisan language, and policy impacts. Pay special attention to loaded language and political framing.",
-            "financial": "Emphasize market implications, economic indicators, financial data accuracy, and business impact. Focus on quantitative claims and market sentiment.",
-            "scientific": "Prioritize scientific accuracy, methodology assessment, peer review status, and evidence quality. Evaluate statistical claims and research validity.",
-            "opinion": "Distinguish between factual claims and opinions. Analyze argumentative structure, logical fallacies, and persuasive techniques."
-        }
-        
-        preset_instruction = preset_instructions.get(preset, preset_instructions["general"])
+        preset_instruction = _PRESET_INSTRUCTIONS.get(preset, _PRESET_INSTRUCTIONS["general"])
         
         return (
             f"You are a world-class expert analysis engine specialized in journalistic content analysis. "
@@ -72,7 +119,7 @@ class OpenAIService:
             "Analyze the provided article text and return your analysis. "
             "Your response must be a JSON object that strictly adheres to the following JSON Schema. "
             "Do not include any other explanatory text in your response, only the JSON object.\n\n"
-            f"JSON Schema:\n{json.dumps(schema, indent=2)}"
+            f"JSON Schema:\n{_prompt_schema(response_model)}"
         )
 
     # --- Legacy Methods (Backward Compatibility) ---
@@ -137,11 +184,6 @@ class OpenAIService:
 
     async def extract_claims(self, text: str, preset: str = "general") -> List[schemas.ExtractedClaim]:
         """Extract and categorize key claims from the content."""
-        
-        # Custom schema for claim extraction
-        class ClaimsResponse(schemas.BaseModel):
-            claims: List[schemas.ExtractedClaim]
-        
         prompt = self._get_system_prompt(
             "extract and categorize all significant claims from the text, assigning unique IDs and importance levels", 
             ClaimsResponse, 
@@ -161,11 +203,11 @@ class OpenAIService:
             f"Claim: {claim}\n\n"
             "Your response must be a JSON object that strictly adheres to the following JSON Schema. "
             "Do not include any other explanatory text in your response, only the JSON object.\n\n"
-            f"JSON Schema:\n{json.dumps(schemas.FactCheckResult.model_json_schema(), indent=2)}"
+            f"JSON Schema:\n{_prompt_schema(schemas.FactCheckResult)}"
         )
         
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.model,
                 response_format={"type": "json_object"},
                 messages=[
@@ -197,11 +239,11 @@ class OpenAIService:
             f"URL being assessed: {url}\n\n"
             "Your response must be a JSON object that strictly adheres to the following JSON Schema. "
             "Do not include any other explanatory text in your response, only the JSON object.\n\n"
-            f"JSON Schema:\n{json.dumps(schemas.SourceCredibilityResult.model_json_schema(), indent=2)}"
+            f"JSON Schema:\n{_prompt_schema(schemas.SourceCredibilityResult)}"
         )
         
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.model,
                 response_format={"type": "json_object"},
                 messages=[
@@ -214,7 +256,7 @@ class OpenAIService:
             # Ensure required fields are set
             response_json["url"] = url
             response_json["domain"] = domain
-            response_json["lastUpdated"] = datetime.datetime.utcnow().isoformat()
+            response_json["lastUpdated"] = datetime.datetime.utcnow()
             
             return schemas.SourceCredibilityResult.model_validate(response_json)
         except Exception as e:
@@ -227,10 +269,6 @@ class OpenAIService:
 
     async def get_executive_summary(self, text: str, preset: str = "general") -> str:
         """Generate an executive summary of the analysis findings."""
-        
-        class SummaryResponse(schemas.BaseModel):
-            summary: str
-        
         prompt = self._get_system_prompt(
             "create a concise executive summary highlighting the key findings and insights from the analysis", 
             SummaryResponse, 
@@ -243,47 +281,47 @@ class OpenAIService:
     def calculate_analysis_score(self, results_dict: Dict[str, Any]) -> float:
         """Calculate an overall analysis score based on the results."""
         
+        default_score = 75.0
+        if not results_dict:
+            return default_score
+        
         score = 0.0
         factors = 0
         
         # Bias analysis score (lower bias = higher score)
-        if "biasAnalysis" in results_dict and results_dict["biasAnalysis"]:
-            bias_score = (1.0 - results_dict["biasAnalysis"].score) * 100
-            score += bias_score
+        bias_analysis = results_dict.get("biasAnalysis")
+        if bias_analysis is not None:
+            score += (1.0 - bias_analysis.score) * 100
             factors += 1
         
         # Sentiment confidence
-        if "sentimentAnalysis" in results_dict and results_dict["sentimentAnalysis"]:
-            sentiment_score = results_dict["sentimentAnalysis"].confidence * 100
-            score += sentiment_score
+        sentiment_analysis = results_dict.get("sentimentAnalysis")
+        if sentiment_analysis is not None:
+            score += sentiment_analysis.confidence * 100
             factors += 1
         
         # Fact-check confidence (average of all fact-checks)
-        if "factCheckResults" in results_dict and results_dict["factCheckResults"]:
-            fact_check_scores = [fc.confidence * 100 for fc in results_dict["factCheckResults"]]
-            if fact_check_scores:
-                avg_fact_score = sum(fact_check_scores) / len(fact_check_scores)
-                score += avg_fact_score
-                factors += 1
+        fact_check_results = results_dict.get("factCheckResults")
+        if fact_check_results:
+            score += sum(fc.confidence for fc in fact_check_results) * 100 / len(fact_check_results)
+            factors += 1
         
         # Source credibility
-        if "sourceCredibility" in results_dict and results_dict["sourceCredibility"]:
-            score += results_dict["sourceCredibility"].credibilityScore
+        source_credibility = results_dict.get("sourceCredibility")
+        if source_credibility is not None:
+            score += source_credibility.credibilityScore
             factors += 1
         
         # Claims extraction quality (more claims with higher importance = higher score)
-        if "claimsExtracted" in results_dict and results_dict["claimsExtracted"]:
-            claims = results_dict["claimsExtracted"]
-            if claims:
-                importance_weights = {"high": 3, "medium": 2, "low": 1}
-                claim_score = sum(importance_weights.get(claim.importance, 1) for claim in claims)
-                # Normalize to 0-100 scale (assume max 10 high-importance claims)
-                normalized_claim_score = min(claim_score / 30 * 100, 100)
-                score += normalized_claim_score
-                factors += 1
+        claims = results_dict.get("claimsExtracted")
+        if claims:
+            claim_score = sum(_CLAIM_IMPORTANCE_WEIGHTS.get(claim.importance, 1) for claim in claims)
+            # Normalize to 0-100 scale (assume max 10 high-importance claims)
+            score += min(claim_score / 30 * 100, 100)
+            factors += 1
         
         # Return average score or default
-        return round(score / factors, 1) if factors > 0 else 75.0
+        return round(score / factors, 1) if factors > 0 else default_score
 
     # --- Utility Methods ---
 
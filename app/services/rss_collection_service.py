@@ -16,6 +16,7 @@ import re
 from langdetect import detect, DetectorFactory
 from langdetect.lang_detect_exception import LangDetectException
 
+from app.api.v1 import schemas
 from app.services.database_service import database_service
 from app.services.content_extraction_service import ContentExtractionService
 
@@ -42,6 +43,8 @@ class RSSCollectionService:
         }
         
         self.content_extractor = ContentExtractionService()
+        # article_id -> extraction task shared by concurrent callers for the same article
+        self._inflight_extractions: Dict[str, asyncio.Task] = {}
         
         # User agent for RSS requests
         self.user_agent = "Mozilla/5.0 (compatible; CritiqueWire/1.0; +https://critiquewire.com)"
@@ -454,7 +457,7 @@ class RSSCollectionService:
                 query = query.or_(f"title.ilike.%{search}%,summary.ilike.%{search}%")
             
             # Get total count with same filters applied
-            count_query = database_service.supabase.table("articles").select("*", count="exact")
+            count_query = database_service.supabase.table("articles").select("id", count="exact")
             
             # Apply same filters to count query
             if rss_only:
@@ -481,28 +484,8 @@ class RSSCollectionService:
             articles = []
             total_articles = 0
         
-        # Format articles for response
-        formatted_articles = []
-        for article in articles:
-            formatted_article = {
-                "id": str(article['id']),
-                "title": article['title'],
-                "content": article['content'],
-                "url": article['url'],
-                "source_name": article['source_name'],
-                "author": article['author'],
-                "published_at": self._format_datetime(article['published_at']),
-                "summary": article['summary'],
-                "source_url": article['source_url'],
-                "collected_at": self._format_datetime(article['collected_at']),
-                "image_url": article['image_url'],
-                "language": article.get('language', 'unknown'),
-                "analysis_status": article['analysis_status'],
-                "analysis_id": str(article['analysis_id']) if article['analysis_id'] else None,
-                "created_at": self._format_datetime(article['created_at']),
-                "updated_at": self._format_datetime(article['updated_at'])
-            }
-            formatted_articles.append(formatted_article)
+        # The selected columns map 1:1 onto CollectedArticle, so rows are validated in one pass
+        formatted_articles = schemas.COLLECTED_ARTICLE_LIST_ADAPTER.validate_python(articles)
         
         # Calculate pagination
         total_pages = (total_articles + limit - 1) // limit
@@ -522,10 +505,25 @@ class RSSCollectionService:
         }
     
     async def extract_article_content(self, article_id: str) -> Optional[Dict[str, Any]]:
-        """Extract full content for an RSS article."""
+        """
+        Extract full content for an RSS article.
+        
+        Concurrent calls for the same article share a single extraction, so a burst of
+        requests scrapes the source site and updates the row only once.
+        """
+        task = self._inflight_extractions.get(article_id)
+        if task is None:
+            task = asyncio.ensure_future(self._extract_article_content(article_id))
+            self._inflight_extractions[article_id] = task
+            task.add_done_callback(lambda _: self._inflight_extractions.pop(article_id, None))
+        
+        # Shielded so one caller disconnecting does not cancel the extraction for the others
+        return await asyncio.shield(task)
+    
+    async def _extract_article_content(self, article_id: str) -> Optional[Dict[str, Any]]:
         try:
             # Get article
-            result = database_service.supabase.table("articles").select("*").eq("id", article_id).execute()
+            result = database_service.supabase.table("articles").select("url, image_url").eq("id", article_id).execute()
             
             if not result.data:
                 return None
@@ -0,0 +1,19 @@
+import time
+
+# (second, formatted timestamp) for the most recent call to iso_now()
+_last_second = -1
+_last_iso = ""
+
+def iso_now() -> str:
+    """
+    Return the current UTC time as an ISO 8601 string at one-second resolution.
+
+    The formatted string is cached and only rebuilt when the wall-clock second changes,
+    so response envelopes can be stamped without allocating a datetime per request.
+    """
+    global _last_second, _last_iso
+    second = time.time_ns() // 1_000_000_000
+    if second != _last_second:
+        _last_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _last_second = second
+    return _last_iso
@@ -0,0 +1,14 @@
+import re
+
+_WORD_RE = re.compile(r"\S+")
+
+def count_words(text: str) -> int:
+    """
+    Count whitespace-delimited words, matching len(text.split()).
+
+    Iterates over the matches instead of materializing the list of words, so long
+    article bodies don't allocate one string per word just to be counted.
+    """
+    if not text:
+        return 0
+    return sum(1 for _ in _WORD_RE.finditer(text))
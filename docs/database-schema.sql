@@ -29,6 +29,11 @@ CREATE INDEX IF NOT EXISTS idx_analyses_analysis_type ON analyses(analysis_type)
 -- Create a full-text search index for title and content_preview
 CREATE INDEX IF NOT EXISTS idx_analyses_search ON analyses USING GIN (to_tsvector('english', title || ' ' || COALESCE(content_preview, '')));
 
+-- Trigram indexes for the history search, which matches substrings with ILIKE '%term%'
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_analyses_title_trgm ON analyses USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_analyses_content_preview_trgm ON analyses USING GIN (content_preview gin_trgm_ops);
+
 -- Enable Row Level Security (RLS)
 ALTER TABLE analyses ENABLE ROW LEVEL SECURITY;
 
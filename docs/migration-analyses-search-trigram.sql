@@ -0,0 +1,14 @@
+-- Migration: Trigram indexes for analysis history search
+-- Description: GET /v1/analyses?search=... filters with title ILIKE '%term%' OR
+-- content_preview ILIKE '%term%'. Leading-wildcard ILIKE cannot use B-tree indexes or the
+-- existing to_tsvector index (idx_analyses_search), so every search scanned the table.
+-- pg_trgm GIN indexes serve ILIKE '%term%' directly, keeping the substring semantics.
+-- Run this in your Supabase SQL Editor. Safe to run multiple times.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_analyses_title_trgm ON analyses
+USING gin (title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_analyses_content_preview_trgm ON analyses
+USING gin (content_preview gin_trgm_ops);
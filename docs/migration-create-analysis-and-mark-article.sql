@@ -0,0 +1,47 @@
+-- Migration: Create an analysis and mark its article as pending in one round-trip
+-- Description: Used by POST /v1/news-feed/articles/{article_id}/analyze, which previously
+-- inserted the analysis and updated the article with two separate requests.
+-- Runs with the caller's privileges, so the existing RLS policies still apply.
+-- Written in PL/pgSQL so the INSERT and UPDATE plans are prepared once per database
+-- session and reused on later calls, instead of being planned on every call.
+-- Safe to re-run: CREATE OR REPLACE updates an earlier LANGUAGE sql version in place.
+
+CREATE OR REPLACE FUNCTION create_analysis_and_mark_article(p_analysis JSONB, p_article_id UUID)
+RETURNS UUID AS $$
+DECLARE
+    v_analysis_id UUID;
+BEGIN
+    INSERT INTO analyses (
+        id, user_id, title, preset, analysis_type, status, article_id,
+        url, content, content_preview, results, metadata
+    )
+    VALUES (
+        (p_analysis->>'id')::uuid,
+        (p_analysis->>'user_id')::uuid,
+        p_analysis->>'title',
+        p_analysis->>'preset',
+        p_analysis->>'analysis_type',
+        p_analysis->>'status',
+        (p_analysis->>'article_id')::uuid,
+        p_analysis->>'url',
+        p_analysis->>'content',
+        p_analysis->>'content_preview',
+        NULLIF(p_analysis->'results', 'null'::jsonb),
+        COALESCE(p_analysis->'metadata', '{}'::jsonb)
+    )
+    RETURNING id INTO v_analysis_id;
+
+    UPDATE articles
+    SET analysis_status = 'pending', analysis_id = v_analysis_id
+    WHERE id = p_article_id;
+
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    RETURN v_analysis_id;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION create_analysis_and_mark_article(JSONB, UUID) IS
+    'Insert an analyses row and point the article at it; returns NULL if the article row was not updated';
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Regression test: an unexpected error in a route must still produce a 500 that
+carries CORS headers, so browser clients can read it instead of seeing an opaque
+CORS failure. The RSS service and authentication are replaced with stand-ins, so
+no network access or credentials are needed.
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+# Settings are required at import time; the values are never used to call anything
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-secret")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+from fastapi.testclient import TestClient
+
+from app.core.security import AuthenticatedUser, get_current_user
+from app.main import app
+from app.services.rss_collection_service import rss_collection_service
+
+async def _failing_news_feed(*args, **kwargs):
+    raise RuntimeError("simulated database failure")
+
+def test_unhandled_error_keeps_cors_headers():
+    """A route raising an unexpected exception returns a readable 500 with CORS headers."""
+    print("=== Testing CORS headers on an unhandled route error ===")
+
+    original = rss_collection_service.get_news_feed
+    rss_collection_service.get_news_feed = _failing_news_feed
+    app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(
+        id="00000000-0000-0000-0000-000000000000"
+    )
+    try:
+        response = TestClient(app, raise_server_exceptions=False).get(
+            "/v1/news-feed", headers={"Origin": "https://frontend.example"}
+        )
+    finally:
+        rss_collection_service.get_news_feed = original
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 500, response.status_code
+    assert response.json() == {"detail": "Internal server error"}, response.content
+    assert "access-control-allow-origin" in response.headers, dict(response.headers)
+    print("✅ 500 response carries access-control-allow-origin")
+
+if __name__ == "__main__":
+    test_unhandled_error_keeps_cors_headers()
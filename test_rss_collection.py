@@ -111,7 +111,8 @@ async def test_database_connection():
     try:
         print("\n🗄️  Testing Database Connection")
         
-        from app.core.config import supabase_client
+        from app.core.config import get_supabase_client
+        supabase_client = get_supabase_client()
         
         # Test basic connection
         result = supabase_client.table("collected_articles").select("count").execute()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Regression test for the synchronous (streamed) mode of POST /v1/analyses.
+
+Once the first section has been sent the response status is already 200, so a
+section that fails afterwards must show up as null in a complete JSON body rather
+than truncating it. OpenAI calls and authentication are replaced with stand-ins,
+so no network access or credentials are needed.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+# Settings are required at import time; the values are never used to call anything
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-secret")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+from fastapi.testclient import TestClient
+
+from app.api.v1.schemas import AnalysisOptions
+from app.core.security import AuthenticatedUser, get_current_user_with_token
+from app.main import app
+from app.services.analysis_cache_service import analysis_cache_service
+from app.services.openai_service import openai_service
+
+async def _summary(content, preset):
+    return "A short summary."
+
+async def _failing_sentiment(content, preset):
+    # Fail after the executive summary has been streamed
+    await asyncio.sleep(0.05)
+    raise RuntimeError("simulated OpenAI failure")
+
+_CONTENT = "Regression test content for a streamed analysis."
+_OPTIONS = {
+    "includeBiasAnalysis": False,
+    "includeSentimentAnalysis": True,
+    "includeFactCheck": False,
+    "includeClaimExtraction": False,
+    "includeExecutiveSummary": True,
+}
+
+def _post_analysis(summary, sentiment):
+    """POST a synchronous analysis with the given stand-ins for the two OpenAI sections."""
+    originals = (openai_service.get_executive_summary, openai_service.get_sentiment_analysis)
+    openai_service.get_executive_summary = summary
+    openai_service.get_sentiment_analysis = sentiment
+    app.dependency_overrides[get_current_user_with_token] = lambda: {
+        "user": AuthenticatedUser(id="00000000-0000-0000-0000-000000000000"),
+        "token": "test-token",
+    }
+    try:
+        return TestClient(app).post("/v1/analyses", json={
+            "content": _CONTENT,
+            "title": "Stream regression",
+            "async_mode": False,
+            "options": _OPTIONS,
+        })
+    finally:
+        openai_service.get_executive_summary, openai_service.get_sentiment_analysis = originals
+        app.dependency_overrides.clear()
+
+def _cache_key():
+    return analysis_cache_service.make_key(_CONTENT, "general", AnalysisOptions(**_OPTIONS).model_dump_json())
+
+def test_failing_section_streams_null():
+    """A section raising after the response has started is emitted as null."""
+    print("=== Testing failed section in streamed analysis ===")
+    analysis_cache_service._entries.clear()
+
+    response = _post_analysis(_summary, _failing_sentiment)
+
+    assert response.status_code == 200, response.status_code
+    results = json.loads(response.content)["data"]["results"]
+    assert results["executiveSummary"] == "A short summary.", results
+    assert results["sentimentAnalysis"] is None, results
+    assert results["factCheckResults"] == [], results
+    print("✅ Failed section was streamed as null in a complete JSON body")
+
+    # The partial result must not be served from the cache to the next request
+    assert analysis_cache_service.get(_cache_key(), allow_stale=True) is None
+    print("✅ Partial result was not cached")
+    analysis_cache_service._entries.clear()
+
+def test_raising_sections_fall_back_to_stale_cache():
+    """Sections that all raise are served from a stale cache entry instead of a 500."""
+    print("=== Testing stale fallback when every section raises ===")
+    analysis_cache_service._entries.clear()
+    stale_results = b'{"executiveSummary":"Earlier summary."}'
+    analysis_cache_service.set(_cache_key(), stale_results)
+
+    fresh_ttl = analysis_cache_service.fresh_ttl
+    analysis_cache_service.fresh_ttl = 0
+    try:
+        response = _post_analysis(_failing_sentiment, _failing_sentiment)
+    finally:
+        analysis_cache_service.fresh_ttl = fresh_ttl
+        analysis_cache_service._entries.clear()
+
+    assert response.status_code == 200, response.status_code
+    data = json.loads(response.content)["data"]
+    assert data["stale"] is True, data
+    assert data["results"]["executiveSummary"] == "Earlier summary.", data
+    print("✅ Stale cached result was returned")
+
+    # The flag is part of the documented response, not only of this streamed body
+    properties = app.openapi()["components"]["schemas"]["AnalysisResultsData"]["properties"]
+    assert "stale" in properties, sorted(properties)
+    print("✅ stale is declared in the AnalysisResultsData schema")
+
+if __name__ == "__main__":
+    test_failing_section_streams_null()
+    test_raising_sections_fall_back_to_stale_cache()